@@ -11,12 +11,15 @@ It then prints two LaTeX tables:
 from math import cos, exp
 from operator import ge
 import os
+import sys
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from re import M
 from statistics import mean
 from tkinter import W
 from data_visualisation.experimental_data import MOLECULES_DATA, exp_data, MOLECULE_NAME_MAPPING, DENIS_MOLECULES  # Experimental data
-from get_properties.electronic_transition_parser import parse_file, get_solvatation_correction # Parsing functions
+from get_properties.electronic_transition_parser import parse_file, get_solvatation_correction, initialize_data # Parsing functions
 from data_visualisation.make_plots import generate_plot_experiment_computed, generate_plot_experiment_multiple_computed, generate_plot_computed_multiple_computed, generate_plot_experiment_multiple_computed_rapport
 from data_visualisation.latex_table import generate_latex_table, generate_latex_metrics_table
 import json
@@ -108,39 +111,49 @@ def main(generate_plots, compute_data):
 
     json_file = "computed_transitions_data"
     # Data storage structure: molecule -> method -> calculation type -> {energy, wavelength, oscillator}
-    dic_abs = {data["name"]: {method_optimization: {method_luminescence: {} for method_luminescence in METHODS_LUMINESCENCE_ABS} for method_optimization in METHODS_OPTIMIZATION_GROUND} for data in MOLECULES_DATA}
-    dic_fluo = {data["name"]: {method_optimization: {method_luminescence: {} for method_luminescence in METHODS_LUMINESCENCE_FLUO} for method_optimization in METHODS_OPTIMIZATION_EXCITED} for data in MOLECULES_DATA}
     if compute_data:
-        # Generate new data if store_data is True
+        # Generate new data if store_data is True, the dictionaries are filled while parsing
         print("Collecting computational data...")
+        dic_abs = {}
+        dic_fluo = {}
+        # Parsing tasks: (dictionary, data name, molecule, method_optimization, method_luminescence, solvant_correction)
+        parse_tasks = []
         for data in MOLECULES_DATA:
             molecule = data["name"]
+            # Calculation directories of the molecule are listed once, missing calculations are not sent to the parser
+            existing_dirs = {entry.name for entry in os.scandir(molecule) if entry.is_dir()} if os.path.isdir(molecule) else set()
+            dic_abs[molecule] = {}
             abs_solvant_correction = get_solvatation_correction(molecule, "", "ABS@MO62Xtddft", warnings_list)
             for method_optimization in METHODS_OPTIMIZATION_GROUND:
+                dic_abs[molecule][method_optimization] = {}
                 for method_luminescence in METHODS_LUMINESCENCE_ABS:
-                    if method_luminescence == "ABS@CC2":
-                        abs_result = parse_file(molecule, method_optimization, method_luminescence, abs_solvant_correction)
-                    else: 
-                        abs_result = parse_file(molecule, method_optimization, method_luminescence)
-                    if abs_result:
-                        dic_abs[molecule][method_optimization][method_luminescence] = abs_result
-                    else:
-                        print(f"⚠️️ No absorbance data found for {molecule} with optimization {method_optimization} and luminescence {method_luminescence}.")
+                    solvant_correction = abs_solvant_correction if method_luminescence == "ABS@CC2" else 0
+                    dic_abs[molecule][method_optimization][method_luminescence] = initialize_data()
+                    if f"{molecule}{method_optimization}-{method_luminescence}" in existing_dirs:
+                        parse_tasks.append((dic_abs, "absorbance", molecule, method_optimization, method_luminescence, solvant_correction))
+            dic_fluo[molecule] = {}
             fluo_solvant_correction = get_solvatation_correction(molecule, "", "FLUO@MO62Xtddft", warnings_list)
             for method_optimization in METHODS_OPTIMIZATION_EXCITED:
+                dic_fluo[molecule][method_optimization] = {}
                 for method_luminescence in METHODS_LUMINESCENCE_FLUO:
-                    if method_luminescence == "FLUO@CC2":
-                        fluo_result = parse_file(molecule, method_optimization, method_luminescence, fluo_solvant_correction)
-                    else:
-                        fluo_result = parse_file(molecule, method_optimization, method_luminescence)
-                    if fluo_result:
-                        dic_fluo[molecule][method_optimization][method_luminescence] = fluo_result
-                    else:
-                        print(f"⚠️️ No fluorescence data found for {molecule} with optimization {method_optimization} and luminescence {method_luminescence}.")
-            with open(f"{json_file}_abs.json", "w") as f:
-                json.dump(dic_abs, f)
-            with open(f"{json_file}_fluo.json", "w") as f:
-                json.dump(dic_fluo, f)
+                    solvant_correction = fluo_solvant_correction if method_luminescence == "FLUO@CC2" else 0
+                    dic_fluo[molecule][method_optimization][method_luminescence] = initialize_data()
+                    if f"{molecule}{method_optimization}-{method_luminescence}" in existing_dirs:
+                        parse_tasks.append((dic_fluo, "fluorescence", molecule, method_optimization, method_luminescence, solvant_correction))
+
+        # The output files are independent and parsed in parallel, sent by chunks to limit the inter-process overhead
+        workers = os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(parse_tasks) // (4 * workers))
+            results = executor.map(parse_file, *zip(*(task[2:] for task in parse_tasks)), chunksize=chunksize)
+            for (dic, data_name, molecule, method_optimization, method_luminescence, _), result in zip(parse_tasks, results):
+                if not result:
+                    print(f"⚠️️ No {data_name} data found for {molecule} with optimization {method_optimization} and luminescence {method_luminescence}.")
+                dic[molecule][method_optimization][method_luminescence] = result or {}
+        with open(f"{json_file}_abs.json", "w") as f:
+            json.dump(dic_abs, f)
+        with open(f"{json_file}_fluo.json", "w") as f:
+            json.dump(dic_fluo, f)
     else:
         # Load data from JSON files if not generating new data
         print("Loading computational data from JSON files...")
@@ -164,19 +177,16 @@ def main(generate_plots, compute_data):
     METHODS_ABS = {'': METHODS_LUMINESCENCE_ABS, '_ACCURATE': METHODS_LUMINESCENCE_ABS_ACCURATE}
     METHODS_FLUO = {'': METHODS_LUMINESCENCE_FLUO, '_ACCURATE': METHODS_LUMINESCENCE_FLUO_ACCURATE}
     
+    # Data and methods of each luminescence type
+    luminescence_settings = {
+        'Absorption': (dic_abs, METHODS_OPTIMIZATION_GROUND, METHODS_ABS),
+        'Fluorescence': (dic_fluo, METHODS_OPTIMIZATION_EXCITED, METHODS_FLUO),
+    }
+
     # Print LaTeX tables
     for methods_type in ['', '_ACCURATE']:
-        abs_luminescence_methods = METHODS_ABS[methods_type]
-        fluo_luminescence_methods = METHODS_FLUO[methods_type]
-        for luminescence_type in ['Absorption', 'Fluorescence']:
-            if luminescence_type == 'Absorption':
-                computed_data = dic_abs
-                methods_optimization = METHODS_OPTIMIZATION_GROUND
-                methods_luminescence = abs_luminescence_methods
-            else:
-                computed_data = dic_fluo
-                methods_optimization = METHODS_OPTIMIZATION_EXCITED
-                methods_luminescence = fluo_luminescence_methods
+        for luminescence_type, (computed_data, methods_optimization, methods_luminescence_types) in luminescence_settings.items():
+            methods_luminescence = methods_luminescence_types[methods_type]
             
             generate_latex_table(exp_data,
                                 luminescence_type=luminescence_type,
@@ -264,10 +274,7 @@ def main(generate_plots, compute_data):
     all_tables = "all_tables.tex"
     tex_files = sorted(f for f in os.listdir(output_dir) if f.endswith('.tex') and f != all_tables)
     with open(os.path.join(output_dir, all_tables), 'w') as outfile:
-        for fname in tex_files:
-            filepath = os.path.join(output_dir, fname)
-            outfile.write(f"\\input{{{filepath}}}\n")
-            outfile.write("\\newpage\n")
+        outfile.write("".join(f"\\input{{{os.path.join(output_dir, fname)}}}\n\\newpage\n" for fname in tex_files))
     print(f"All tables have been compiled into {all_tables}.")
     # change ABS by FLUO in DIC
     DIC=['ABS@B3LYPtddft', 'ABS@PBE0tddft', 'ABS@wB97X-D3tddft', 'ABS@CAM-B3LYPtddft', 'ABS@MO62Xtddft', 'ABS@CISD', 'ABS@B2PLYPtddft', 'ABS@CC2_COSMO', 'ABS@ADC2_COSMO']
@@ -425,58 +432,63 @@ def main(generate_plots, compute_data):
     
     if generate_plots: 
         print("Generating plots...")
-        for luminescence_type in ['Absorption', 'Fluorescence']:
-            if luminescence_type == 'Absorption':
-                computed_data = dic_abs
-                methods_optimization = METHODS_OPTIMIZATION_GROUND
-                methods_luminescence = METHODS_LUMINESCENCE_ABS_PRESENTED
-            else:
-                computed_data = dic_fluo
-                methods_optimization = METHODS_OPTIMIZATION_EXCITED
-                methods_luminescence = METHODS_LUMINESCENCE_FLUO_PRESENTED
-            for prop in ['energy', 'dissymmetry_factor']:
-                gauges = ['length', 'velocity'] if prop == 'dissymmetry_factor' else [None]
-                dissymmetry_variants = ['strength', 'vector'] if prop == 'dissymmetry_factor' else [None]
-                for gauge in gauges:
-                    for dissymmetry_variant in dissymmetry_variants:
-                        generate_plot_experiment_computed(exp_data=exp_data,
-                                                    luminescence_type=luminescence_type,
-                                                    computed_data=computed_data,
-                                                    methods_optimization=methods_optimization,
-                                                    methods_luminescence=methods_luminescence,
-                                                    gauge=gauge,
-                                                    dissymmetry_variant=dissymmetry_variant,
-                                                    prop=prop,
-                                                    output_dir=f"{output_dir_plots}/{prop}",
-                                                    molecules=DENIS_MOLECULES,
-                                                    )
-                        for method_optimization in methods_optimization:
-                            generate_plot_experiment_multiple_computed(exp_data=exp_data,
-                                                            luminescence_type=luminescence_type,
-                                                            computed_data=computed_data,
-                                                            methods_optimization=[method_optimization],
-                                                            methods_luminescence=methods_luminescence,
-                                                            gauge=gauge,
-                                                            dissymmetry_variant=dissymmetry_variant,
-                                                            prop=prop,
-                                                            molecules=DENIS_MOLECULES,
-                                                            output_dir=f"{output_dir_plots}/{prop}",
-                                                            output_filebasename="all"
-                                                            )
-                            methods_luminescence_groups = METHODS_LUMINESCENCE_ABS_GROUPS if luminescence_type == 'Absorption' else METHODS_LUMINESCENCE_FLUO_GROUPS
-                            for methods_luminescence_group in methods_luminescence_groups:
+        plot_settings = {
+            'Absorption': (dic_abs, METHODS_OPTIMIZATION_GROUND, METHODS_LUMINESCENCE_ABS_PRESENTED, METHODS_LUMINESCENCE_ABS_GROUPS),
+            'Fluorescence': (dic_fluo, METHODS_OPTIMIZATION_EXCITED, METHODS_LUMINESCENCE_FLUO_PRESENTED, METHODS_LUMINESCENCE_FLUO_GROUPS),
+        }
+        # One pool for all the experiment vs computed plots, sized to the CPUs this process may run on (e.g. a Slurm allocation)
+        # process_cpu_count is Python >= 3.13 and sched_getaffinity Linux only, the total CPU count is the portable fallback
+        if hasattr(os, 'process_cpu_count'):
+            plot_workers = os.process_cpu_count() or 1
+        elif hasattr(os, 'sched_getaffinity'):
+            plot_workers = len(os.sched_getaffinity(0))
+        else:
+            plot_workers = os.cpu_count() or 1
+        with multiprocessing.Pool(plot_workers) as pool:
+            for luminescence_type, (computed_data, methods_optimization, methods_luminescence, methods_luminescence_groups) in plot_settings.items():
+                for prop in ['energy', 'dissymmetry_factor']:
+                    gauges = ['length', 'velocity'] if prop == 'dissymmetry_factor' else [None]
+                    dissymmetry_variants = ['strength', 'vector'] if prop == 'dissymmetry_factor' else [None]
+                    for gauge in gauges:
+                        for dissymmetry_variant in dissymmetry_variants:
+                            generate_plot_experiment_computed(exp_data=exp_data,
+                                                        luminescence_type=luminescence_type,
+                                                        computed_data=computed_data,
+                                                        methods_optimization=methods_optimization,
+                                                        methods_luminescence=methods_luminescence,
+                                                        gauge=gauge,
+                                                        dissymmetry_variant=dissymmetry_variant,
+                                                        prop=prop,
+                                                        output_dir=f"{output_dir_plots}/{prop}",
+                                                        molecules=DENIS_MOLECULES,
+                                                        pool=pool,
+                                                        )
+                            for method_optimization in methods_optimization:
                                 generate_plot_experiment_multiple_computed(exp_data=exp_data,
                                                                 luminescence_type=luminescence_type,
                                                                 computed_data=computed_data,
                                                                 methods_optimization=[method_optimization],
-                                                                methods_luminescence=methods_luminescence_group,
+                                                                methods_luminescence=methods_luminescence,
                                                                 gauge=gauge,
                                                                 dissymmetry_variant=dissymmetry_variant,
                                                                 prop=prop,
                                                                 molecules=DENIS_MOLECULES,
                                                                 output_dir=f"{output_dir_plots}/{prop}",
-                                                                output_filebasename=method_optimization + "_" + "_".join(methods_luminescence_group).replace("'",'').replace('[','').replace(']','')
+                                                                output_filebasename="all"
                                                                 )
+                                for methods_luminescence_group in methods_luminescence_groups:
+                                    generate_plot_experiment_multiple_computed(exp_data=exp_data,
+                                                                    luminescence_type=luminescence_type,
+                                                                    computed_data=computed_data,
+                                                                    methods_optimization=[method_optimization],
+                                                                    methods_luminescence=methods_luminescence_group,
+                                                                    gauge=gauge,
+                                                                    dissymmetry_variant=dissymmetry_variant,
+                                                                    prop=prop,
+                                                                    molecules=DENIS_MOLECULES,
+                                                                    output_dir=f"{output_dir_plots}/{prop}",
+                                                                    output_filebasename=method_optimization + "_" + "_".join(methods_luminescence_group).replace("'",'').replace('[','').replace(']','')
+                                                                    )
 
         generate_plot_computed_multiple_computed(main_method_optimization="",
                                                 main_method_luminescence="ABS@CC2_COSMO",
@@ -500,12 +512,10 @@ def main(generate_plots, compute_data):
                                                 output_dir=f"{output_dir_plots}/energy",
                                                 output_filebasename="CC2_ref")
         
-    # Print unique warning messages
-    seen_warnings = set()
-    for warning in warnings_list:
-        if warning not in seen_warnings:
-            print(warning)
-            seen_warnings.add(warning)
+    # Print unique warning messages (in order of appearance) in a single write
+    unique_warnings = dict.fromkeys(warnings_list)
+    if unique_warnings:
+        sys.stdout.write("\n".join(unique_warnings) + "\n")
     #generate_comparison_plots()
     #print(f"Plots done")
 
@@ -260,23 +260,31 @@ DENIS_MOLECULES = [
 #    "Boranil_CO2H+RBINOL_CN",
 ]
 
+# Transition energies of all molecules, computed at once from the wavelengths
+abs_wavelengths = np.array([data["absorption_wavelength"] for data in MOLECULES_DATA], dtype=np.float64)
+fluo_wavelengths = np.array([data["fluorescence_wavelength"] for data in MOLECULES_DATA], dtype=np.float64)
+abs_energies = nm_to_eV / abs_wavelengths
+fluo_energies = nm_to_eV / fluo_wavelengths
+zero_zero_energies = (fluo_energies + abs_energies) / 2
+stokes_shifts = abs_energies - fluo_energies
+
 # Build experimental data dictionary for each molecule
-exp_data = {}
-for data in MOLECULES_DATA:
-    molecule = data["name"]
-    exp_data[molecule] = {
+exp_data = {
+    data["name"]: {
         'Absorption': {
-            'energy': nm_to_eV / data["absorption_wavelength"],
+            'energy': abs_E,
             'wavelength' : data["absorption_wavelength"],
             'oscillator_strength': data["exp_abs_osc"],
             'dissymmetry_factor': data["exp_gabs"]
         },
         'Fluorescence': {
-            'energy': nm_to_eV / data["fluorescence_wavelength"],
+            'energy': fluo_E,
             'wavelength' : data["fluorescence_wavelength"],
             'oscillator_strength': data["exp_fluo_osc"],
             'dissymmetry_factor': data["exp_glum"]
         },
-        '0-0': (nm_to_eV / data["fluorescence_wavelength"] + nm_to_eV / data["absorption_wavelength"])/2,
-        'Stokes_shift': nm_to_eV / data["absorption_wavelength"] - nm_to_eV / data["fluorescence_wavelength"],
-    }
\ No newline at end of file
+        '0-0': zero_zero,
+        'Stokes_shift': stokes,
+    }
+    for data, abs_E, fluo_E, zero_zero, stokes in zip(MOLECULES_DATA, abs_energies.tolist(), fluo_energies.tolist(), zero_zero_energies.tolist(), stokes_shifts.tolist())
+}
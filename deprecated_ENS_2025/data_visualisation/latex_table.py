@@ -9,10 +9,9 @@ and circular dichroism computational chemistry data.
 Please check main function `generate_latex_table` for usage and parameters.
 """
 
-from matplotlib import table
+from functools import lru_cache
 import numpy as np
 from pathlib import Path
-from scipy.stats import pearsonr
 
 
 def get_property_header(property_name, data_type):
@@ -102,6 +101,40 @@ def get_property_header(property_name, data_type):
         return headers[property_name][data_type]
     return f"{property_name}-{data_type}"
 
+@lru_cache(maxsize=None)
+def get_format_spec(property_name):
+    """
+    Get the format specification used for a property in LaTeX tables.
+    
+    Parameters
+    ----------
+    property_name : str
+        Name of the property to format
+    
+    Returns
+    -------
+    str
+        Format specification (e.g. '.2f')
+    """
+    if property_name == "wavelength":
+        return ".0f"
+    elif property_name in ["energy"]:
+        return ".2f"
+    elif property_name.startswith("oscillator"):
+        return ".2f"
+    elif property_name.startswith("rotational_strength"):
+        return ".1f"
+    elif property_name.startswith("dipole_strength"):
+        return ".0f"
+    elif property_name.startswith("dissymmetry_factor"):
+        return ".2f"
+    elif property_name.startswith("angle"):
+        return ".0f"
+    elif property_name == "D2" or property_name == "P2" or property_name == "M2":
+        return ".2f"
+    else:
+        return ".2f"
+
 def format_value(data, property_name):
     """
     Format a value for LaTeX table according to property type.
@@ -118,27 +151,10 @@ def format_value(data, property_name):
     str
         Formatted value as string
     """
-    value = data.get(property_name, np.nan)
+    value = data.get(property_name)
     
     if isinstance(value, (int, float)) and not np.isnan(value):
-        if property_name == "wavelength":
-            return f"{value:.0f}"
-        elif property_name in ["energy"]:
-            return f"{value:.2f}"
-        elif property_name.startswith("oscillator"):
-            return f"{value:.2f}"
-        elif property_name.startswith("rotational_strength"):
-            return f"{value:.1f}"
-        elif property_name.startswith("dipole_strength"):
-            return f"{value:.0f}"
-        elif property_name.startswith("dissymmetry_factor"):
-            return f"{value:.2f}"
-        elif property_name.startswith("angle"):
-            return f"{value:.0f}"
-        elif property_name == "D2" or property_name == "P2" or property_name == "M2":
-            return f"{value:.2f}"
-        else:
-            return f"{value:.2f}"
+        return format(value, get_format_spec(property_name))
     return "N/A"
 
 def generate_table_header(properties, data_types):
@@ -183,6 +199,33 @@ def get_adjusted_prop(prop, gauge=None, variant=None):
         adjusted_prop = prop
     return adjusted_prop
 
+def get_property_column(data: dict, molecules: list, *keys) -> np.ndarray:
+    """
+    Gather a property of several molecules into one array.
+    
+    Parameters
+    ----------
+    data : dict
+        Nested dictionary indexed first by molecule name
+    molecules : list
+        Molecule names, in the order of the returned array
+    *keys : str
+        Keys followed inside the entry of each molecule (e.g. method_optimization, method_luminescence, property)
+    
+    Returns
+    -------
+    np.ndarray
+        Float array with NaN where the value is missing
+    """
+    def lookup(molecule):
+        value = data.get(molecule)
+        for key in keys:
+            if not isinstance(value, dict):
+                return np.nan
+            value = value.get(key)
+        return np.nan if value is None else value
+    return np.array([lookup(molecule) for molecule in molecules], dtype=float)
+
 def generate_latex_table(exp_data: dict, luminescence_type: str, computed_data: dict, methods_optimization: list, 
                          methods_luminescence: list, properties: list, output_filename, output_dir="latex_tables", gauges: list[str] = ['length', 'velocity'], 
                          dissymmetry_variants: list[str] = ['vector', 'strength'], 
@@ -247,119 +290,113 @@ def generate_latex_table(exp_data: dict, luminescence_type: str, computed_data:
         return format_value(data_dict, adjusted_prop)
     
     def create_row(row_name, data_dict, props, gauge=None, variant=None):
-        """Create a table row with appropriate formatting"""
+        """Create a table row with appropriate formatting, the cells are returned joined by ' & '"""
         row_name = ' '.join(row_name.split('_'))
         if variant: # if variant is defined gauge should be defined too
-            row = [f"{row_name} ({gauge}, {variant})"]
+            row_name = f"{row_name} ({gauge}, {variant})"
         elif gauge:
-            row = [f"{row_name} ({gauge})"]
-        else:
-            row = [row_name]
+            row_name = f"{row_name} ({gauge})"
             
-        has_data = False
-        
-        for prop in props:
-            value = get_property_value(data_dict, prop, gauge, variant)
-            row.append(value)
-            if value != "N/A" and value != "":
-                has_data = True
+        values = [get_property_value(data_dict, prop, gauge, variant) for prop in props]
+        has_data = any(value != "N/A" and value != "" for value in values)
                 
-        return row, has_data
+        return " & ".join([row_name, *values]), has_data
     
-    # Open output file for writing
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    with open(Path(output_dir) / output_filename, 'w') as f:
-        # Helper function to write to file
-        def writeline(line=""):
-            f.write(line + "\n")
-        def table_header():
-            writeline("\\begin{table}[H]")
-            writeline("  \\centering")
-            writeline("  \\scriptsize")
-            column_spec = "ll" + "c" * len(properties)
-            writeline(f"  \\begin{{tabular}}{{{column_spec}}}")
-            writeline("    \\toprule")
-            writeline(generate_table_header(properties, [luminescence_type]))
-            writeline("    \\midrule")
-        def table_footer(caption, label, table_num):
-            writeline("    \\bottomrule")
-            writeline("  \\end{tabular}")
-            if not caption:
-                caption = f"{luminescence_type} ({gauges}, {dissymmetry_variants}) chiroptical data for the studied molecules." 
-            writeline(f"  \\caption{{{caption} (Part {table_num})}}")
-            if not label:
-                label = f"table_{luminescence_type}_{gauges}_{dissymmetry_variants}"
-            writeline(f"  \\label{{tab:{label}{table_num}}}")
-            writeline("\\end{table}\n\n")
+    # Lines are collected and written to the output file in a single call
+    lines = []
+    def writeline(line=""):
+        lines.append(line)
+    def table_header():
+        writeline("\\begin{table}[H]")
+        writeline("  \\centering")
+        writeline("  \\scriptsize")
+        column_spec = "ll" + "c" * len(properties)
+        writeline(f"  \\begin{{tabular}}{{{column_spec}}}")
+        writeline("    \\toprule")
+        writeline(generate_table_header(properties, [luminescence_type]))
+        writeline("    \\midrule")
+    def table_footer(caption, label, table_num):
+        writeline("    \\bottomrule")
+        writeline("  \\end{tabular}")
+        if not caption:
+            caption = f"{luminescence_type} ({gauges}, {dissymmetry_variants}) chiroptical data for the studied molecules." 
+        writeline(f"  \\caption{{{caption} (Part {table_num})}}")
+        if not label:
+            label = f"table_{luminescence_type}_{gauges}_{dissymmetry_variants}"
+        writeline(f"  \\label{{tab:{label}{table_num}}}")
+        writeline("\\end{table}\n\n")
 
-        # Variable to limit the size of the table
-        table_num = 0
-        table_rows = 0
-        max_rows = 65
+    # Variable to limit the size of the table
+    table_num = 0
+    table_rows = 0
+    max_rows = 65
 
-        table_header()
-        
-        # Table content
-        for molecule in molecules:
-            if molecule not in molecule_data:
-                continue
-                
-            display_name = molecule_name_mapping.get(molecule, molecule)
-            
-            # Experimental row
-            exp_data_for_molecule = molecule_data[molecule].get(luminescence_type, {})
-            exp_row, _ = create_row("Exp", exp_data_for_molecule, properties)
+    table_header()
+
+    # Method display names and row variants do not depend on the molecule, they are set once
+    display_opts = [method_opt.split('@')[1] if '@' in method_opt else method_opt for method_opt in methods_optimization]
+    display_lums = [method_lum.split('@')[1] if '@' in method_lum else method_lum for method_lum in methods_luminescence]
+    has_dissymmetry = 'dissymmetry_factor' in properties
+    gauge_dependent_props = ['oscillator_strength', 'rotational_strength', 'dipole_strength', 'angle']
+    use_gauges = any(prop in properties for prop in gauge_dependent_props) or has_dissymmetry
+    row_gauges = gauges if use_gauges else [None]
+    row_variants = dissymmetry_variants if has_dissymmetry else [None]
+    
+    # Table content
+    for molecule in molecules:
+        if molecule not in molecule_data:
+            continue
             
-            # Computed rows
-            computed_rows = []
+        display_name = molecule_name_mapping.get(molecule, molecule)
+        
+        # Experimental row
+        exp_data_for_molecule = molecule_data[molecule].get(luminescence_type, {})
+        exp_row, _ = create_row("Exp", exp_data_for_molecule, properties)
+        
+        # Computed rows
+        computed_rows = []
+        molecule_computed_data = computed_data.get(molecule, {})
+        
+        for method_opt, display_opt in zip(methods_optimization, display_opts):
+            method_opt_data = molecule_computed_data.get(method_opt, {})
             
-            for method_opt in methods_optimization:
-                display_opt = method_opt.split('@')[1] if '@' in method_opt else method_opt
+            for method_lum, display_lum in zip(methods_luminescence, display_lums):
+                method_data = method_opt_data.get(method_lum, {})
                 
-                for method_lum in methods_luminescence:
-                    display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
-                    
-                    # Check if we need to handle gauges
-                    has_dissymmetry = 'dissymmetry_factor' in properties
-                    gauge_dependent_props = ['oscillator_strength', 'rotational_strength', 'dipole_strength', 'angle']
-                    use_gauges = any(prop in properties for prop in gauge_dependent_props) or has_dissymmetry
-                    
-                    for gauge in (gauges if use_gauges else [None]):
-                        method_data = {}
-                        if (molecule in computed_data and 
-                            method_opt in computed_data[molecule] and 
-                            method_lum in computed_data[molecule][method_opt]):
-                            method_data = computed_data[molecule][method_opt][method_lum]
-                        
-                        # Base method name
-                        base_name = f"{display_opt}-{display_lum}" 
-                        base_name = base_name.lstrip('-')
+                # Base method name
+                base_name = f"{display_opt}-{display_lum}" 
+                base_name = base_name.lstrip('-')
+                
+                for gauge in row_gauges:
+                    # Create rows for each property
+                    for variant in row_variants:
+                        row, has_data = create_row(base_name, method_data, properties, gauge, variant)
+                        if has_data and (not has_dissymmetry or len(properties) > 1):
+                            computed_rows.append(row)
                         
-                        # Create rows for each property
-                        for variant in (dissymmetry_variants if has_dissymmetry else [None]):
-                            row, has_data = create_row(base_name, method_data, properties, gauge, variant)
-                            if has_data and (not has_dissymmetry or len(properties) > 1):
-                                computed_rows.append(row)
-                            
-            
-            # writeline rows
-            table_rows += len(computed_rows) + 3 # 2 for experimental row and 1 for midrule
-            if table_rows > max_rows:
-                table_num += 1
-                table_rows = len(computed_rows) + 3
-                table_footer(caption, label, table_num)
-                table_header()
-            else:
-                writeline("    \\midrule")
-            multirow_count = len(computed_rows) + 1
-            writeline(f"    \\multirow{{{multirow_count}}}{{*}}{{{display_name}}} & " + " & ".join(exp_row) + " \\\\\\\\")
-            
-            for row in computed_rows:
-                writeline(f"     & " + " & ".join(row) + " \\\\")
-            
         
-        # Table footer
-        table_footer(caption, label, table_num)
+        # writeline rows
+        table_rows += len(computed_rows) + 3 # 2 for experimental row and 1 for midrule
+        if table_rows > max_rows:
+            table_num += 1
+            table_rows = len(computed_rows) + 3
+            table_footer(caption, label, table_num)
+            table_header()
+        else:
+            writeline("    \\midrule")
+        multirow_count = len(computed_rows) + 1
+        writeline(f"    \\multirow{{{multirow_count}}}{{*}}{{{display_name}}} & {exp_row} \\\\\\\\")
+        
+        for row in computed_rows:
+            writeline(f"     & {row} \\\\")
+        
+    
+    # Table footer
+    table_footer(caption, label, table_num)
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(output_dir) / output_filename, 'w') as f:
+        f.write("\n".join(lines) + "\n")
     print(f"Latex table saved to {output_dir}/{output_filename}")
 
 def generate_latex_metrics_table(exp_data: dict, luminescence_type: str, computed_data: dict, methods_optimization: list, 
@@ -385,89 +422,78 @@ def generate_latex_metrics_table(exp_data: dict, luminescence_type: str, compute
         else:
             output_filename = f"{luminescence_type}_{prop}_{gauge}_{dissymmetry_variant}_data.tex"
 
-    with open(Path(output_dir) / output_filename, 'w') as f:
-        # Helper function to write to file
-        def writeline(line=""):
-            f.write(line + "\n")
-        writeline("\\begin{table}[htbp]")
-        writeline("  \\centering")
-        writeline("  \\begin{tabular}{lrrrr}")
-        writeline("    \\toprule")
-        writeline("    Method & MSE & MAE & SD & R$^2$ \\\\")
-        writeline("    \\midrule")
-        
+    # Lines are collected and written to the output file in a single call
+    lines = []
+    def writeline(line=""):
+        lines.append(line)
+    writeline("\\begin{table}[htbp]")
+    writeline("  \\centering")
+    writeline("  \\begin{tabular}{lrrrr}")
+    writeline("    \\toprule")
+    writeline("    Method & MSE & MAE & SD & R$^2$ \\\\")
+    writeline("    \\midrule")
+    
+    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
+    # The experimental values are the same for every method, a value present but NaN is kept and gives N/A metrics
+    experimental_column = get_property_column(molecule_data, molecules, luminescence_type, prop)
+    experimental_found = np.array([prop in molecule_data.get(molecule, {}).get(luminescence_type, {}) for molecule in molecules], dtype=bool)
+    # Values of every method are gathered as the columns of a (molecules, methods) matrix
+    base_names = []
+    calculated_columns = []
+    for method_opt in methods_optimization:
+        display_opt = method_opt.split('@')[1] if '@' in method_opt else method_opt
         
-        for method_opt in methods_optimization:
-            display_opt = method_opt.split('@')[1] if '@' in method_opt else method_opt
-            
-            for method_lum in methods_luminescence:
-                # Base method name
-                display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
-                base_name = f"{display_opt}-{display_lum}" 
-                base_name = base_name.lstrip('-')
-                base_name = ' '.join(base_name.split('_'))
-                if dissymmetry_variant: # if variant is defined gauge should be defined too
-                    base_name = f"{base_name} ({gauge}, {dissymmetry_variant})"
-                elif gauge:
-                    base_name = f"{base_name} ({gauge})"
-                
-                # Get the data
-                calculated = []
-                experimental = []
-                warnings_list_temp = []
-                for molecule in molecules:
-                    # Get the computed data
-                    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
-                    if (molecule in computed_data and 
-                        method_opt in computed_data[molecule] and 
-                        method_lum in computed_data[molecule][method_opt] and
-                        adjusted_prop in computed_data[molecule][method_opt][method_lum] and
-                        not np.isnan(computed_data[molecule][method_opt][method_lum][adjusted_prop])):
-                        calculated_data = computed_data[molecule][method_opt][method_lum][adjusted_prop]
-                    else:
-                        warnings_list_temp.append(f"Warning: Computational value for {prop} is missing for {molecule} using {base_name} for {luminescence_type}.")
-                        continue
-                    
-                    # Get the experimental data
-                    if (molecule_data and 
-                        molecule in molecule_data and 
-                        luminescence_type in molecule_data[molecule] and 
-                        prop in molecule_data[molecule][luminescence_type]):
-                        experimental_data = molecule_data[molecule][luminescence_type][prop]
-                    else:
-                        warnings_list_temp.append(f"Warning: Experimental value for {prop} is missing for {molecule}.")
-                        continue
+        for method_lum in methods_luminescence:
+            # Base method name
+            display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
+            base_name = f"{display_opt}-{display_lum}" 
+            base_name = base_name.lstrip('-')
+            base_name = ' '.join(base_name.split('_'))
+            if dissymmetry_variant: # if variant is defined gauge should be defined too
+                base_name = f"{base_name} ({gauge}, {dissymmetry_variant})"
+            elif gauge:
+                base_name = f"{base_name} ({gauge})"
+            base_names.append(base_name)
+            calculated_columns.append(get_property_column(computed_data, molecules, method_opt, method_lum, adjusted_prop))
+    calculated_matrix = np.array(calculated_columns, dtype=np.float64).reshape(len(base_names), len(molecules)).T
+    calculated_found = ~np.isnan(calculated_matrix)
+    # Molecules for which both data are found, for each method
+    valid = calculated_found & experimental_found[:, None]
 
-                    # If both data are found add the data to the lists
-                    calculated.append(calculated_data)
-                    experimental.append(experimental_data)
+    # Calculate the metrics of all methods at once, the values outside of valid do not contribute
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        errors = np.where(valid, calculated_matrix - experimental_column[:, None], 0)
+        mse = errors.sum(axis=0) / counts
+        mae = np.abs(errors).sum(axis=0) / counts
+        sd = np.sqrt(np.where(valid, (errors - mse) ** 2, 0).sum(axis=0) / counts)
+        sd[counts < 2] = np.nan
+        # Squared Pearson correlation, the p-value of scipy's pearsonr is not needed
+        experimental_matrix = np.where(valid, experimental_column[:, None], 0)
+        dx = np.where(valid, experimental_matrix - experimental_matrix.sum(axis=0) / counts, 0)
+        dy = np.where(valid, calculated_matrix - np.where(valid, calculated_matrix, 0).sum(axis=0) / counts, 0)
+        var_product = (dx * dx).sum(axis=0) * (dy * dy).sum(axis=0)
+        r_sq = np.where((counts >= 2) & (var_product != 0), (dx * dy).sum(axis=0) ** 2 / var_product, np.nan)
 
-                # Calculate metrics
-                if len(calculated) == 0:
-                    continue
-                else:
-                    warnings_list.extend(warnings_list_temp)
-                    errors = [c - e for c, e in zip(calculated, experimental)]
-                    mse = np.mean(errors) if errors else np.nan
-                    mae = np.mean(np.abs(errors)) if errors else np.nan
-                    sd = np.std(errors) if len(errors) > 1 else np.nan
-                    r_sq = np.nan
-                    if len(calculated) >= 2:
-                        pearson_result = pearsonr(experimental, calculated)
-                        r_sq = pearson_result[0] ** 2 # type: ignore
-                    mse_str = f"{mse:.2f}" if not np.isnan(mse) else 'N/A'
-                    mae_str = f"{mae:.2f}" if not np.isnan(mae) else 'N/A'
-                    sd_str = f"{sd:.2f}" if not np.isnan(sd) else 'N/A'
-                    r_sq_str = f"{r_sq:.2f}" if not np.isnan(r_sq) else 'N/A'
-                
-                writeline(f"    {base_name} & {mse_str} & {mae_str} & {sd_str} & {r_sq_str} \\\\")
-        writeline("    \\bottomrule")
-        writeline("  \\end{tabular}")
-        if not caption:
-            caption = f"{luminescence_type} metrics table for {prop} ({gauge}, {dissymmetry_variant})."
-        writeline(f"  \\caption{{{caption}}}")
-        if not label:
-            label = f"table_metric_{prop}_{luminescence_type}_{gauge}_{dissymmetry_variant}"
-        writeline(f"  \\label{{tab:{label}}}")
-        writeline("\\end{table}\n\n")
+    for method_index, base_name in enumerate(base_names):
+        if not counts[method_index]:
+            continue
+        for molecule, calculated_ok, experimental_ok in zip(molecules, calculated_found[:, method_index], experimental_found):
+            if not calculated_ok:
+                warnings_list.append(f"Warning: Computational value for {prop} is missing for {molecule} using {base_name} for {luminescence_type}.")
+            elif not experimental_ok:
+                warnings_list.append(f"Warning: Experimental value for {prop} is missing for {molecule}.")
+        mse_str, mae_str, sd_str, r_sq_str = (f"{metric[method_index]:.2f}" if not np.isnan(metric[method_index]) else 'N/A' for metric in (mse, mae, sd, r_sq))
+        writeline(f"    {base_name} & {mse_str} & {mae_str} & {sd_str} & {r_sq_str} \\\\")
+    writeline("    \\bottomrule")
+    writeline("  \\end{tabular}")
+    if not caption:
+        caption = f"{luminescence_type} metrics table for {prop} ({gauge}, {dissymmetry_variant})."
+    writeline(f"  \\caption{{{caption}}}")
+    if not label:
+        label = f"table_metric_{prop}_{luminescence_type}_{gauge}_{dissymmetry_variant}"
+    writeline(f"  \\label{{tab:{label}}}")
+    writeline("\\end{table}\n\n")
+    with open(Path(output_dir) / output_filename, 'w') as f:
+        f.write("\n".join(lines) + "\n")
     print(f"Latex metric table saved to {output_dir}/{output_filename}")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from ast import main
-from math import exp
+from math import exp, isnan
 import re
 import numpy as np
 import os
@@ -8,10 +8,8 @@ from scipy import special
 matplotlib.use('Agg')  # Set non-interactive backend before importing pyplot
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
-from latex_table import get_adjusted_prop
-from sklearn.metrics import mean_absolute_error
+from latex_table import get_adjusted_prop, get_property_column
 from sklearn.linear_model import LinearRegression
-from scipy.stats import pearsonr
 
 matplotlib.rcParams.update({
     "text.usetex": True,
@@ -128,10 +126,10 @@ def add_diagonal_reference_line(data_x, data_y, xylim=None):
     
     Parameters:
     ----------
-    data_x : list
-        List of data points for the x-axis.
-    data_y : list
-        List of data points for the y-axis.
+    data_x : list or np.ndarray
+        Data points for the x-axis.
+    data_y : list or np.ndarray
+        Data points for the y-axis.
     
     Returns:
     -------
@@ -140,12 +138,16 @@ def add_diagonal_reference_line(data_x, data_y, xylim=None):
     axis_max : float
         Maximum value for the x and y axes.
     """
+    # Extrema of each data set are computed once on arrays, NaN values are ignored
+    data_x = np.asarray(data_x, dtype=np.float64)
+    data_y = np.asarray(data_y, dtype=np.float64)
+    x_min, x_max = float(np.nanmin(data_x)), float(np.nanmax(data_x))
     if xylim is not None:
         axis_min = xylim[0]
         axis_max = xylim[1]
     else:
-        min_val = min(min(data_x), min(data_y))
-        max_val = max(max(data_x), max(data_y))
+        min_val = min(x_min, float(np.nanmin(data_y)))
+        max_val = max(x_max, float(np.nanmax(data_y)))
         padding = 0.1 * (max_val - min_val)
         axis_min = min_val - padding
         axis_max = max_val + padding
@@ -156,7 +158,7 @@ def add_diagonal_reference_line(data_x, data_y, xylim=None):
     plt.xlim(axis_min, axis_max)
     plt.ylim(axis_min, axis_max)
     try:
-        if axis_max - max(data_x) >= min(data_x) - axis_min:
+        if axis_max - x_max >= x_min - axis_min:
             loc= 'right'
         else:
             loc= 'left'
@@ -179,6 +181,27 @@ def _plot(x, y, molecule, method):
                 s=s_plot,
                 alpha=0.85,
                 label=visual_molecule_attributes[molecule]["name"])
+
+
+def _plot_molecules(points):
+    """
+    Scatter the (x, y, molecule, method) points with a single call per molecule,
+    each point being colored by its method.
+    """
+    points_by_molecule = {}
+    for x, y, molecule, method in points:
+        points_by_molecule.setdefault(molecule, []).append((x, y, visual_method_attributes[method]["color"]))
+    for molecule, molecule_points in points_by_molecule.items():
+        x, y, colors = zip(*molecule_points)
+        facecolor = list(colors) if visual_molecule_attributes[molecule]["filled"] else 'none'
+        plt.scatter(x,
+                    y,
+                    marker=visual_molecule_attributes[molecule]["marker"],
+                    edgecolor=list(colors),
+                    facecolor=facecolor,
+                    s=s_plot,
+                    alpha=0.85,
+                    label=visual_molecule_attributes[molecule]["name"])
     
 
 def _common_save_plot(x_data, y_data, x_label, y_label, output_dir, output_filename, molecule_handles, axes_label_size, method_handles=None, xylim=None, loc=None):
@@ -187,7 +210,7 @@ def _common_save_plot(x_data, y_data, x_label, y_label, output_dir, output_filen
     """
     if not x_data or not y_data:
         print("No data to plot.")
-        plt.close()
+        plt.clf()
         return
 
     if loc is not None:
@@ -229,7 +252,7 @@ def _common_save_plot(x_data, y_data, x_label, y_label, output_dir, output_filen
         print(f"Plot saved to {output_dir}/{output_filename} in format pdf and png")
     except Exception as e:
         print(f"Error saving plot {output_dir}/{output_filename}: {e}")
-    plt.close()
+    plt.clf() # The figure is cleared rather than closed so that the next plot reuses it
 
 
 def get_label(prop, luminescence_type, gauge=None):
@@ -278,7 +301,7 @@ def make_molecule_legend_handle(molecule_handles, molecule, color):
 
 def generate_plot_experiment_computed(exp_data: dict, luminescence_type: str, computed_data: dict, methods_optimization: list, 
                                     methods_luminescence: list, prop: str, output_filebasename="", output_dir="plot_comparison",
-                                    gauge=None, dissymmetry_variant=None, molecules=None):
+                                    gauge=None, dissymmetry_variant=None, molecules=None, pool=None):
     """
     Generate plots comparing experimental and computed data for electronic properties.
     Parameters:
@@ -305,62 +328,67 @@ def generate_plot_experiment_computed(exp_data: dict, luminescence_type: str, co
         Variant used in the dissymmetry factor calculations ('strength' or 'vector').
     molecules : list, optional
         List of molecules to include in the plot. If None, all molecules from exp_data will be used.
+    pool : multiprocessing.Pool, optional
+        Pool, shared across calls, in which the plots are drawn. If None, the plots are drawn one after the other.
     """
     # Handle default arguments
     if molecules is None:
         molecules = list(exp_data.keys())
 
+    # The data of each plot is collected here, the plots are then drawn (in parallel with a pool)
+    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
+    experimental_column = get_property_column(exp_data, molecules, luminescence_type, prop)
+    experimental_found = np.array([prop in exp_data.get(molecule, {}).get(luminescence_type, {}) for molecule in molecules], dtype=bool)
+    plot_tasks = []
     for method_optimization in methods_optimization:
         for method_luminescence in methods_luminescence:
             display_lum = method_luminescence.split('@')[1] if '@' in method_luminescence else method_luminescence
-            color = visual_method_attributes[display_lum]["color"]
-            calculated = []
-            experimental = []
-            molecule_handles = []
-            for molecule in molecules:
-                adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
-                if (molecule in computed_data and 
-                    method_optimization in computed_data[molecule] and 
-                    method_luminescence in computed_data[molecule][method_optimization] and
-                    adjusted_prop in computed_data[molecule][method_optimization][method_luminescence] and
-                    not np.isnan(computed_data[molecule][method_optimization][method_luminescence][adjusted_prop])):
-                    calculated_data = computed_data[molecule][method_optimization][method_luminescence][adjusted_prop]
-                else:
-                    continue
-
-                
-                if (exp_data and 
-                    molecule in exp_data and 
-                    luminescence_type in exp_data[molecule] and 
-                    prop in exp_data[molecule][luminescence_type]):
-                    experimental_data = exp_data[molecule][luminescence_type][prop]
-                else:
-                    continue
-
-                calculated.append(calculated_data)
-                experimental.append(experimental_data)
-                _plot(experimental_data, calculated_data, molecule, display_lum)
-                make_molecule_legend_handle(molecule_handles, molecule, color)
+            calculated_column = get_property_column(computed_data, molecules, method_optimization, method_luminescence, adjusted_prop)
+            # Molecules with both a computed and an experimental value
+            valid = ~np.isnan(calculated_column) & experimental_found
+            calculated = calculated_column[valid].tolist()
+            experimental = experimental_column[valid].tolist()
+            plotted_molecules = [molecule for molecule, is_valid in zip(molecules, valid) if is_valid]
             
             # Complete and save the plot if we have data
             if calculated:
                 label_text, axes_label_size = get_label(prop, luminescence_type, gauge)
-                _common_save_plot(
-                    x_data=experimental,
-                    y_data=calculated,
-                    x_label=f"Experimental {label_text}",
-                    y_label=f"Computed {label_text}",
-                    output_dir=output_dir,
-                    output_filename=f"{luminescence_type}_{prop}_{gauge}_{dissymmetry_variant}_{method_optimization}_{display_lum}_{output_filebasename}",
-                    molecule_handles=molecule_handles,
-                    axes_label_size=axes_label_size
+                output_filename = f"{luminescence_type}_{prop}_{gauge}_{dissymmetry_variant}_{method_optimization}_{display_lum}_{output_filebasename}"
+                plot_tasks.append((experimental, calculated, plotted_molecules, display_lum, label_text, axes_label_size, output_dir, output_filename))
 
-                )
+    if pool is None:
+        for plot_task in plot_tasks:
+            _plot_experiment_computed_method(*plot_task)
+    else:
+        pool.starmap(_plot_experiment_computed_method, plot_tasks)
+
+
+def _plot_experiment_computed_method(experimental, calculated, molecules, display_lum, label_text, axes_label_size, output_dir, output_filename):
+    """
+    Draw and save one experiment versus computed plot of generate_plot_experiment_computed.
+    Runs in a worker process and only receives plain lists and strings.
+    """
+    color = visual_method_attributes[display_lum]["color"]
+    molecule_handles = []
+    for experimental_data, calculated_data, molecule in zip(experimental, calculated, molecules):
+        _plot(experimental_data, calculated_data, molecule, display_lum)
+        make_molecule_legend_handle(molecule_handles, molecule, color)
+    _common_save_plot(
+        x_data=experimental,
+        y_data=calculated,
+        x_label=f"Experimental {label_text}",
+        y_label=f"Computed {label_text}",
+        output_dir=output_dir,
+        output_filename=output_filename,
+        molecule_handles=molecule_handles,
+        axes_label_size=axes_label_size
+
+    )
 
 
 def generate_plot_experiment_multiple_computed(exp_data: dict, luminescence_type: str, computed_data: dict, methods_optimization: list, 
                                     methods_luminescence: list, prop: str, output_filebasename="", output_dir="plot_comparison",
-                                    gauge=None, dissymmetry_variant=None, molecules=None):
+                                    gauge=None, dissymmetry_variant=None, molecules=None, pool=None):
     """
     Generate plots comparing experimental and computed data for electronic properties.
     Parameters:
@@ -397,44 +425,33 @@ def generate_plot_experiment_multiple_computed(exp_data: dict, luminescence_type
     method_handles = []
     molecule_handles = []
     molecule_legend_done = False
+    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant) # Same key for every method and molecule
+    points = [] # Drawn once all methods are collected, see _plot_molecules
+    # The experimental values are the same for every method, a value present but NaN is kept
+    experimental_column = get_property_column(exp_data, molecules, luminescence_type, prop).tolist()
+    experimental_found = [prop in exp_data.get(molecule, {}).get(luminescence_type, {}) for molecule in molecules]
     for method_opt in methods_optimization:
         for method_lum in methods_luminescence:
-            calculated = []
-            experimental = []
             display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
-            for molecule in molecules:
-                adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
-                if (molecule in computed_data and 
-                    method_opt in computed_data[molecule] and 
-                    method_lum in computed_data[molecule][method_opt] and
-                    adjusted_prop in computed_data[molecule][method_opt][method_lum] and
-                    not np.isnan(computed_data[molecule][method_opt][method_lum][adjusted_prop])):
-                    calculated_data = computed_data[molecule][method_opt][method_lum][adjusted_prop]
-                else:
+            calculated_column = get_property_column(computed_data, molecules, method_opt, method_lum, adjusted_prop).tolist()
+            for molecule, calculated_data, experimental_data, experimental_ok in zip(molecules, calculated_column, experimental_column, experimental_found):
+                if isnan(calculated_data) or not experimental_ok:
                     continue
 
-                if (molecule in exp_data and 
-                    luminescence_type in exp_data[molecule] and 
-                    prop in exp_data[molecule][luminescence_type]):
-                    experimental_data = exp_data[molecule][luminescence_type][prop]
-                else:
-                    continue
-
-                calculated.append(calculated_data)
                 all_calculated.append(calculated_data)
-                experimental.append(experimental_data)
                 all_experimental.append(experimental_data)
-                _plot(experimental_data, calculated_data, molecule, display_lum)
+                points.append((experimental_data, calculated_data, molecule, display_lum))
                 if not molecule_legend_done:
                     make_molecule_legend_handle(molecule_handles, molecule, 'black')
             if not molecule_legend_done:
                 molecule_legend_done = True
             method_handles.append(Line2D([0], [0], color=visual_method_attributes[display_lum]["color"], lw=4, label=fr"\textbf{{{visual_method_attributes[display_lum]['name']}}}"))
 
+    _plot_molecules(points)
     output_filename=f"{luminescence_type}_multiple_exp_{prop}_{gauge}_{dissymmetry_variant}_{output_filebasename}"
     if not all_calculated or not all_experimental:
         print(f"No data to plot for {output_filename}.")
-        plt.close()
+        plt.clf()
         return
 
     label_text, axes_label_size = get_label(prop, luminescence_type, gauge)
@@ -500,41 +517,24 @@ def generate_plot_computed_multiple_computed(main_method_optimization: str, main
     method_handles = []
     molecule_handles = []
     molecule_legend_done = False
+    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant) # Same key for every method and molecule
+    points = [] # Drawn once all methods are collected, see _plot_molecules
+    # The reference values of the main method are the same for every method
+    main_method_column = get_property_column(computed_data, molecules, main_method_optimization, main_method_luminescence, adjusted_prop).tolist()
     for method_opt in methods_optimization:
         for method_lum in methods_luminescence:
-            calculated = []
-            experimental = []
             display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
-            for molecule in molecules:
-                # Get the computed data
-                adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
+            calculated_column = get_property_column(computed_data, molecules, method_opt, method_lum, adjusted_prop).tolist()
+            for molecule, calculated_data, main_method_data in zip(molecules, calculated_column, main_method_column):
                 if molecule == "Boranil_NO2+RBINOL_H" and display_lum == 'B2PLYPTtddft':
                     continue
-                if (molecule in computed_data and 
-                    method_opt in computed_data[molecule] and 
-                    method_lum in computed_data[molecule][method_opt] and
-                    adjusted_prop in computed_data[molecule][method_opt][method_lum] and
-                    not np.isnan(computed_data[molecule][method_opt][method_lum][adjusted_prop])):
-                    calculated_data = computed_data[molecule][method_opt][method_lum][adjusted_prop]
-                else:
-                    continue
-                
-                # Get the experimental data
-                if (molecule in computed_data and 
-                    method_opt in computed_data[molecule] and 
-                    method_lum in computed_data[molecule][main_method_optimization] and
-                    adjusted_prop in computed_data[molecule][main_method_optimization][main_method_luminescence] and
-                    not np.isnan(computed_data[molecule][main_method_optimization][main_method_luminescence][adjusted_prop])):
-                    main_method_data = computed_data[molecule][main_method_optimization][main_method_luminescence][adjusted_prop]
-                else:
+                # If both data are found add the data to the lists
+                if isnan(calculated_data) or isnan(main_method_data):
                     continue
 
-                # If both data are found add the data to the lists
-                calculated.append(calculated_data)
                 all_calculated.append(calculated_data)
-                experimental.append(main_method_data)
                 all_experimental.append(main_method_data)
-                _plot(main_method_data, calculated_data, molecule, display_lum)
+                points.append((main_method_data, calculated_data, molecule, display_lum))
                 if not molecule_legend_done:
                     make_molecule_legend_handle(molecule_handles, molecule, "black")
             if not molecule_legend_done:
@@ -542,10 +542,11 @@ def generate_plot_computed_multiple_computed(main_method_optimization: str, main
             method_handles.append(Line2D([0], [0], color=visual_method_attributes[display_lum]["color"], lw=4, label=fr"\textbf{{{visual_method_attributes[display_lum]['name']}}}"))
                     
                 
+    _plot_molecules(points)
     output_filename=f"{luminescence_type}_multiple_computed_{prop}_{gauge}_{dissymmetry_variant}_{output_filebasename}"
     if not all_calculated or not all_experimental:
         print(f"No data to plot for {output_filename}.")
-        plt.close()
+        plt.clf()
         return
 
     label_text, axes_label_size = get_label(prop, luminescence_type, gauge)
@@ -645,42 +646,28 @@ def generate_plot_experiment_multiple_computed_rapport(
     max_len_method_name = 9
     method_x = None
     method_luminescence_name = main_method_luminescence.split('@')[1] if '@' in main_method_luminescence else main_method_luminescence
+    adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant) # Same key for every method and molecule
+    points = [] # Drawn once all methods are collected, see _plot_molecules
+    # The reference values are the same for every method, an experimental value present but NaN is kept
+    if main_method_luminescence == "":
+        experimental_column = get_property_column(exp_data, molecules, luminescence_type, prop).tolist()
+        experimental_found = [prop in exp_data.get(molecule, {}).get(luminescence_type, {}) for molecule in molecules]
+    else:
+        experimental_column = get_property_column(exp_data, molecules, main_method_optimization, main_method_luminescence, adjusted_prop).tolist()
+        experimental_found = [not isnan(experimental_data) for experimental_data in experimental_column]
     for method_opt in methods_optimization:
         for method_lum in methods_luminescence:
             calculated = []
             experimental = []
             display_lum = method_lum.split('@')[1] if '@' in method_lum else method_lum
-            for molecule in molecules:
-                adjusted_prop = get_adjusted_prop(prop, gauge, dissymmetry_variant)
+            calculated_column = get_property_column(computed_data, molecules, method_opt, method_lum, adjusted_prop).tolist()
+            for molecule, calculated_data, experimental_data, experimental_ok in zip(molecules, calculated_column, experimental_column, experimental_found):
                 if not molecule_legend_done:
                     legend_color = '#E95329' if special_molecule and molecule in special_molecule else 'black'
                     make_molecule_legend_handle(molecule_handles, molecule, legend_color)
-                if (molecule in computed_data and 
-                    method_opt in computed_data[molecule] and 
-                    method_lum in computed_data[molecule][method_opt] and
-                    adjusted_prop in computed_data[molecule][method_opt][method_lum] and
-                    not np.isnan(computed_data[molecule][method_opt][method_lum][adjusted_prop])):
-                    calculated_data = computed_data[molecule][method_opt][method_lum][adjusted_prop]
-                else:
+                if isnan(calculated_data) or not experimental_ok:
                     continue
 
-                if main_method_luminescence == "":
-                    if (molecule in exp_data and 
-                        luminescence_type in exp_data[molecule] and 
-                        prop in exp_data[molecule][luminescence_type]):
-                        experimental_data = exp_data[molecule][luminescence_type][prop]
-                    else:
-                        continue
-                else:
-                    if (molecule in exp_data and 
-                    main_method_optimization in exp_data[molecule] and 
-                    main_method_luminescence in exp_data[molecule][main_method_optimization] and
-                    adjusted_prop in exp_data[molecule][main_method_optimization][main_method_luminescence] and
-                    not np.isnan(exp_data[molecule][main_method_optimization][main_method_luminescence][adjusted_prop])):
-                        experimental_data = exp_data[molecule][main_method_optimization][main_method_luminescence][adjusted_prop]
-                    else:
-                        continue
-
                 if molecule in banned_molecule: #and (display_lum == 'B3LYPtddft' or display_lum == 'PBE0tddft'):
                     print(calculated_data, experimental_data, molecule, display_lum)
                     continue
@@ -688,19 +675,23 @@ def generate_plot_experiment_multiple_computed_rapport(
                 experimental.append(experimental_data)
                 all_calculated.append(calculated_data)
                 all_experimental.append(experimental_data)
-                _plot(experimental_data, calculated_data, molecule, display_lum)
+                points.append((experimental_data, calculated_data, molecule, display_lum))
 
             if Do_metrics and not(method_lum == main_method_luminescence):
-                MAE = mean_absolute_error(experimental, calculated)
-                pearson_result = pearsonr(experimental, calculated)
-                R2 = pearson_result[0] ** 2 # type: ignore
+                experimental_values, calculated_values = np.asarray(experimental), np.asarray(calculated)
+                MAE = np.abs(calculated_values - experimental_values).mean()
+                # Squared Pearson correlation from the centered dot products
+                dx = experimental_values - experimental_values.mean()
+                dy = calculated_values - calculated_values.mean()
+                R2 = (dx @ dy) ** 2 / ((dx @ dx) * (dy @ dy))
                 if not (prop == 'dissymmetry_factor' and (display_lum == 'B3LYPtddft' or display_lum == 'PBE0tddft')):
                     model = LinearRegression().fit(np.array(experimental).reshape(-1, 1), np.array(calculated).reshape(-1, 1))
                 else:
                     #return the index of the maximum and minimum value of experimental and remove the value correponding to this index from calculated and experimental
-                    calculated = [x for i, x in enumerate(calculated) if i not in [i for i, x in enumerate(experimental) if x == max(experimental) or x == min(experimental)]]
-                    experimental = [x for i, x in enumerate(experimental) if i not in [i for i, x in enumerate(experimental) if x == max(experimental) or x == min(experimental)]]
-                    i = [i for i, x in enumerate(experimental) if x == max(experimental) or x == min(experimental)]
+                    experimental_max, experimental_min = max(experimental), min(experimental)
+                    kept = [i for i, x in enumerate(experimental) if not (x == experimental_max or x == experimental_min)]
+                    calculated = [calculated[i] for i in kept]
+                    experimental = [experimental[i] for i in kept]
                     model = LinearRegression().fit(np.array(experimental).reshape(-1, 1), np.array(calculated).reshape(-1, 1))
                 trend = model.predict(np.array(experimental).reshape(-1, 1))
                 plt.plot(experimental, trend, linewidth=2,
@@ -737,10 +728,11 @@ def generate_plot_experiment_multiple_computed_rapport(
             ha='left', va='bottom'
             )
 
+    _plot_molecules(points)
     output_filename=f"Trend_{luminescence_type}_multiple_exp_{prop}_{gauge}_{dissymmetry_variant}_{output_filebasename}"
     if not all_calculated or not all_experimental:
         print(f"No data to plot for {output_filename}.")
-        plt.close()
+        plt.clf()
         return
     
     if method_luminescence_name in visual_method_attributes:
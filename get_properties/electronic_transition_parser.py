@@ -23,13 +23,88 @@ Usage:
     correction = get_solvatation_correction(molecule, method, calc_type, warnings_list)
 """
 
-from math import sqrt
+from functools import lru_cache
+from math import acos, degrees, isnan, sqrt
+import mmap
 import re
 import os
 import warnings
-import numpy as np
 from constants import nm_to_eV, au_to_cgs_charge_length, eV_to_au, fine_structure_constant, h_cgs, pi, elementary_charge_cgs, m_e_cgs, eV_to_cgs
 
+ORCA_SPECTRUM_HEADER = b'ABSORPTION SPECTRUM VIA TRANSITION ELECTRIC DIPOLE MOMENTS' # First spectrum, the search starts there
+
+# The following functionnals create a imaginary transition thus the second need to be taken
+#if any(x in filename for x in ["ABS@MO62X", "ABS@CAM-B3LYP", "ABS@B3LYP", "ABS@B2PLYP", "ABS@CC2"]) and "Boranil_NO2+RBINOL_H" in filename:
+#    pattern = (
+#    r'0-1\S+\s+->\s+2-1\S+\s+'
+#    r'\s+(?P<energy_eV>[-+]?\d+\.\d+)'
+#    r'\s+(?P<energy_rcm>[-+]?\d+\.\d+)'
+#    r'\s+(?P<wavelength>[-+]?\d+\.\d+)'
+#    r'\s+(?P<strength>[-+]?\d+\.\d+)'
+#    r'\s+(?P<transition_dipole1>[-+]?\d+\.\d+)'
+#    r'\s+(?P<transition_dipole2>[-+]?\d+\.\d+)'
+#    r'\s+(?P<transition_dipole3>[-+]?\d+\.\d+)'
+#    r'\s+(?P<transition_dipole4>[-+]?\d+\.\d+)?'
+#    )
+#else:
+# Bytes pattern searched over the whole file, [ \t] keeps each match on a single line
+ORCA_TRANSITION_PATTERN = re.compile(
+rb'0-1\S+[ \t]+->[ \t]+1-1\S+[ \t]+'
+rb'[ \t]+(?P<energy_eV>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<energy_rcm>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<wavelength>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<strength>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<transition_dipole1>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<transition_dipole2>[-+]?\d+\.\d+)'
+rb'[ \t]+(?P<transition_dipole3>[-+]?\d+\.\d+)'
+rb'(?:[ \t]+(?P<transition_dipole4>[-+]?\d+\.\d+))?'
+)
+
+TURBOMOLE_PATTERNS = {field: re.compile(pattern) for field, pattern in {
+    'energy': rb'(\d+\.\d+)\s+e\.V\.',
+    'DX': rb'xdiplen\s+\|\s+\S+\s+\|\s+(\S+)',
+    'DY': rb'ydiplen\s+\|\s+\S+\s+\|\s+(\S+)',
+    'DZ': rb'zdiplen\s+\|\s+\S+\s+\|\s+(\S+)',
+    'PX': rb'xdipvel\s+\|\s+\S+\s+\|\s+(\S+)',
+    'PY': rb'ydipvel\s+\|\s+\S+\s+\|\s+(\S+)',
+    'PZ': rb'zdipvel\s+\|\s+\S+\s+\|\s+(\S+)',
+    'MX': rb'xangmom\s+\|\s+\S+\s+\|\s+(\S+)',
+    'MY': rb'yangmom\s+\|\s+\S+\s+\|\s+(\S+)',
+    'MZ': rb'zangmom\s+\|\s+\S+\s+\|\s+(\S+)',
+    'oscillator_strength_length': rb'oscillator strength \(length gauge\)\s+:\s+(\S+)',
+    'oscillator_strength_velocity': rb'oscillator strength \(velocity gauge\)\s+:\s+(\S+)',
+    'rotational_strength_length': rb'Rotator strength \(length gauge\)\s+:\s+(\S+)\s+10\^\(-40\)\*erg\*cm\^3',
+    'rotational_strength_velocity': rb'Rotator strength \(velocity gauge\)\s+:\s+(\S+)\s+10\^\(-40\)\*erg\*cm\^3',
+}.items()}
+# Substring of every line matched by the pattern of each field, used to jump to the candidate lines
+TURBOMOLE_LITERALS = {
+    'energy': b'e.V.',
+    'DX': b'xdiplen',
+    'DY': b'ydiplen',
+    'DZ': b'zdiplen',
+    'PX': b'xdipvel',
+    'PY': b'ydipvel',
+    'PZ': b'zdipvel',
+    'MX': b'xangmom',
+    'MY': b'yangmom',
+    'MZ': b'zangmom',
+    'oscillator_strength_length': b'oscillator strength (length gauge)',
+    'oscillator_strength_velocity': b'oscillator strength (velocity gauge)',
+    'rotational_strength_length': b'Rotator strength (length gauge)',
+    'rotational_strength_velocity': b'Rotator strength (velocity gauge)',
+}
+
+TURBOMOLE_SEARCH_ORDER = [
+    'energy', 
+    'DX', 'DY', 'DZ',
+    'PX', 'PY', 'PZ',
+    'MX', 'MY', 'MZ',
+    'oscillator_strength_length',
+    'oscillator_strength_velocity',
+    'rotational_strength_length',
+    'rotational_strength_velocity'
+]
+
 def parse_file(molecule: str, method_optimization: str, method_luminescence: str, solvant_correction: float=0, working_dir=None) -> dict:
     """
     Parse ORCA or TURBOMOLE ricc2 output files for electronic transition data values.
@@ -66,7 +141,12 @@ def parse_file(molecule: str, method_optimization: str, method_luminescence: str
     """
     if working_dir is None:
         working_dir = os.getcwd()
-    
+    # The same files are requested several times (e.g. for the solvatation correction), a copy is returned so that the cache cannot be modified
+    return dict(_parse_file_cached(molecule, method_optimization, method_luminescence, solvant_correction, working_dir))
+
+@lru_cache(maxsize=None)
+def _parse_file_cached(molecule: str, method_optimization: str, method_luminescence: str, solvant_correction: float, working_dir: str) -> dict:
+    """Cached implementation of parse_file, see its docstring."""
     # Select appropriate file path and parser based on method
     if "CC2" in method_luminescence or "ADC2_COSMO" in method_luminescence or "CC2_COSMO" in method_luminescence:
         filename = f"{working_dir}/{molecule}/{molecule}{method_optimization}-{method_luminescence}/ricc2.out"
@@ -75,12 +155,12 @@ def parse_file(molecule: str, method_optimization: str, method_luminescence: str
         filename = f"{working_dir}/{molecule}/{molecule}{method_optimization}-{method_luminescence}/{molecule}{method_optimization}-{method_luminescence}.out"
         parser_func = parse_orca_format
     
-    if not os.path.exists(filename):
-        #warnings.warn(f"⚠️ Missing file: {filename}", UserWarning)
-        return initialize_data()
-    
+    # The parser opens the file itself, a missing file is caught instead of checked beforehand
     try:
         data = parser_func(filename, solvant_correction)
+    except FileNotFoundError:
+        #warnings.warn(f"⚠️ Missing file: {filename}", UserWarning)
+        return initialize_data()
     except Exception as e:
         warnings.warn(f"⚠️ Error reading file {filename}: {str(e)}", UserWarning)
         return initialize_data()
@@ -128,70 +208,61 @@ def parse_orca_format(filename: str, solvant_correction: float=0):
     as well as transition electric and magnetic dipole moments.
     """
     data = initialize_data()
-    with open(filename, 'r') as f:
-        # The following functionnals create a imaginary transition thus the second need to be taken
-#        if any(x in filename for x in ["ABS@MO62X", "ABS@CAM-B3LYP", "ABS@B3LYP", "ABS@B2PLYP", "ABS@CC2"]) and "Boranil_NO2+RBINOL_H" in filename:
-#            pattern = (
-#            r'0-1\S+\s+->\s+2-1\S+\s+'
-#            r'\s+(?P<energy_eV>[-+]?\d+\.\d+)'
-#            r'\s+(?P<energy_rcm>[-+]?\d+\.\d+)'
-#            r'\s+(?P<wavelength>[-+]?\d+\.\d+)'
-#            r'\s+(?P<strength>[-+]?\d+\.\d+)'
-#            r'\s+(?P<transition_dipole1>[-+]?\d+\.\d+)'
-#            r'\s+(?P<transition_dipole2>[-+]?\d+\.\d+)'
-#            r'\s+(?P<transition_dipole3>[-+]?\d+\.\d+)'
-#            r'\s+(?P<transition_dipole4>[-+]?\d+\.\d+)?'
-#            )
-#        else:
-        pattern = (
-        r'0-1\S+\s+->\s+1-1\S+\s+'
-        r'\s+(?P<energy_eV>[-+]?\d+\.\d+)'
-        r'\s+(?P<energy_rcm>[-+]?\d+\.\d+)'
-        r'\s+(?P<wavelength>[-+]?\d+\.\d+)'
-        r'\s+(?P<strength>[-+]?\d+\.\d+)'
-        r'\s+(?P<transition_dipole1>[-+]?\d+\.\d+)'
-        r'\s+(?P<transition_dipole2>[-+]?\d+\.\d+)'
-        r'\s+(?P<transition_dipole3>[-+]?\d+\.\d+)'
-        r'\s+(?P<transition_dipole4>[-+]?\d+\.\d+)?'
-        )
-        counter = 0
-        for line in f:
-            match = re.search(pattern, line)
-            if match:
-                try:
-                    if counter == 0:
-                        data['energy'] = float(match.group('energy_eV')) + solvant_correction
-                        data['wavelength'] = nm_to_eV / data['energy']
-                        data['oscillator_strength_length'] = float(match.group('strength'))
-                        data['D2'] = float(match.group('transition_dipole1'))
-                        data['DX'] = float(match.group('transition_dipole2'))
-                        data['DY'] = float(match.group('transition_dipole3'))
-                        data['DZ'] = float(match.group('transition_dipole4'))
-                        data['dipole_strength_length'] = data['D2'] * au_to_cgs_charge_length**2
-                    elif counter == 1:
-                        data['oscillator_strength_velocity'] = float(match.group('strength'))
-                        energy_au = data['energy'] / eV_to_au
-                        data['P2'] = float(match.group('transition_dipole1')) / energy_au**2 # Velocity gauge convert to length value
-                        data['PX'] = - float(match.group('transition_dipole2')) / energy_au
-                        data['PY'] = - float(match.group('transition_dipole3')) / energy_au
-                        data['PZ'] = - float(match.group('transition_dipole4')) / energy_au
-                        data['dipole_strength_velocity'] = data['P2'] * au_to_cgs_charge_length**2
-                    elif counter == 2:
-                        data['rotational_strength_length'] = float(match.group('strength'))
-                        data['MX'] = float(match.group('transition_dipole1'))
-                        data['MY'] = float(match.group('transition_dipole2'))
-                        data['MZ'] = float(match.group('transition_dipole3'))
-                        data['M2'] = data['MX']**2 + data['MY']**2 + data['MZ']**2
-                    elif counter == 3:
-                        data['rotational_strength_velocity'] = float(match.group('strength'))
-                        return data
-                    counter += 1
-                except (ValueError, IndexError) as e:
-                    warnings.warn(f"⚠️ Parsing error in {filename}: {str(e)}", UserWarning)
+    # The file is mapped in memory and searched by the regex engine directly
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # The regex starts at the first spectrum header instead of the beginning of the file
+                start = max(0, mm.find(ORCA_SPECTRUM_HEADER))
+                if _read_orca_transitions(mm, data, filename, solvant_correction, start):
                     return data
     warnings.warn(f"⚠️ Missing data in {filename}", UserWarning)
     return data
 
+def _read_orca_transitions(buffer, data: dict, filename: str, solvant_correction: float=0, start: int=0) -> bool:
+    """
+    Fill data with the first transition found in the four ORCA spectra of buffer (bytes or mmap),
+    searching from the offset start.
+
+    Returns True once the four spectra are read or a parsing error is reported
+    (data is then reset to NaN), False if buffer ends before that.
+    """
+    counter = 0
+    for match in ORCA_TRANSITION_PATTERN.finditer(buffer, start):
+        try:
+            if counter == 0:
+                data['energy'] = float(match.group('energy_eV')) + solvant_correction
+                data['wavelength'] = nm_to_eV / data['energy']
+                data['oscillator_strength_length'] = float(match.group('strength'))
+                data['D2'] = float(match.group('transition_dipole1'))
+                data['DX'] = float(match.group('transition_dipole2'))
+                data['DY'] = float(match.group('transition_dipole3'))
+                data['DZ'] = float(match.group('transition_dipole4'))
+                data['dipole_strength_length'] = data['D2'] * au_to_cgs_charge_length**2
+            elif counter == 1:
+                data['oscillator_strength_velocity'] = float(match.group('strength'))
+                energy_au = data['energy'] / eV_to_au
+                data['P2'] = float(match.group('transition_dipole1')) / energy_au**2 # Velocity gauge convert to length value
+                data['PX'] = - float(match.group('transition_dipole2')) / energy_au
+                data['PY'] = - float(match.group('transition_dipole3')) / energy_au
+                data['PZ'] = - float(match.group('transition_dipole4')) / energy_au
+                data['dipole_strength_velocity'] = data['P2'] * au_to_cgs_charge_length**2
+            elif counter == 2:
+                data['rotational_strength_length'] = float(match.group('strength'))
+                data['MX'] = float(match.group('transition_dipole1'))
+                data['MY'] = float(match.group('transition_dipole2'))
+                data['MZ'] = float(match.group('transition_dipole3'))
+                data['M2'] = data['MX']**2 + data['MY']**2 + data['MZ']**2
+            elif counter == 3:
+                data['rotational_strength_velocity'] = float(match.group('strength'))
+                return True
+            counter += 1
+        except (ValueError, IndexError, TypeError) as e: # TypeError: optional transition_dipole4 missing
+            warnings.warn(f"⚠️ Parsing error in {filename}: {str(e)}", UserWarning)
+            data.update(initialize_data()) # No partially filled record
+            return True
+    return False
+
 def parse_turbomole_format(filename: str, solvant_correction: float=0):
     """
     Parse TURBOMOLE output files for electronic transition data values.
@@ -201,84 +272,78 @@ def parse_turbomole_format(filename: str, solvant_correction: float=0):
     as well as transition electric and magnetic dipole moments.
     """
     data = initialize_data()
-    patterns = {
-        'energy': r'(\d+\.\d+)\s+e\.V\.',
-        'DX': r'xdiplen\s+\|\s+\S+\s+\|\s+(\S+)',
-        'DY': r'ydiplen\s+\|\s+\S+\s+\|\s+(\S+)',
-        'DZ': r'zdiplen\s+\|\s+\S+\s+\|\s+(\S+)',
-        'PX': r'xdipvel\s+\|\s+\S+\s+\|\s+(\S+)',
-        'PY': r'ydipvel\s+\|\s+\S+\s+\|\s+(\S+)',
-        'PZ': r'zdipvel\s+\|\s+\S+\s+\|\s+(\S+)',
-        'MX': r'xangmom\s+\|\s+\S+\s+\|\s+(\S+)',
-        'MY': r'yangmom\s+\|\s+\S+\s+\|\s+(\S+)',
-        'MZ': r'zangmom\s+\|\s+\S+\s+\|\s+(\S+)',
-        'oscillator_strength_length': r'oscillator strength \(length gauge\)\s+:\s+(\S+)',
-        'oscillator_strength_velocity': r'oscillator strength \(velocity gauge\)\s+:\s+(\S+)',
-        'rotational_strength_length': r'Rotator strength \(length gauge\)\s+:\s+(\S+)\s+10\^\(-40\)\*erg\*cm\^3',
-        'rotational_strength_velocity': r'Rotator strength \(velocity gauge\)\s+:\s+(\S+)\s+10\^\(-40\)\*erg\*cm\^3',
-    }
-
-    search_order = [
-        'energy', 
-        'DX', 'DY', 'DZ',
-        'PX', 'PY', 'PZ',
-        'MX', 'MY', 'MZ',
-        'oscillator_strength_length',
-        'oscillator_strength_velocity',
-        'rotational_strength_length',
-        'rotational_strength_velocity'
-    ]
-    
-    found_fields = set()
-    
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-        line_idx = 0
-        # Process each field in the expected order; then one if found move to the next and search in the next line
-        for field in search_order:
-            if field not in patterns:
-                warnings.warn(f"⚠️ Field '{field}' not defined in patterns dictionary", UserWarning)
-                continue
-                
-            pattern = patterns[field]
-            field_found = False
-            while line_idx < len(lines) and not field_found:
-                line = lines[line_idx]
-                match = re.search(pattern, line)
-                if match:
-                    try:
-                        if field == 'energy':
-                            data[field] = float(match.group(1)) + solvant_correction
-                            data['wavelength'] = nm_to_eV / data['energy']
-                            energy_au = data['energy'] / eV_to_au
-                        elif field == 'PX' or field == 'PY' or field == 'PZ':
-                            data[field] = - float(match.group(1)) / energy_au # type: ignore # Velocity gauge convert to length value
-                        else:
-                            data[field] = float(match.group(1))                        
-                        found_fields.add(field)
-                        field_found = True
-                        
-                    except (ValueError, IndexError) as e:
-                        warnings.warn(f"⚠️ Error parsing {field} in {filename}: {str(e)}", UserWarning)
-                line_idx += 1
+    # The file is mapped in memory, only the pages around the searched fields are read
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            found_count = 0
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                found_count = _read_turbomole_fields(content, data, filename, solvant_correction)
     
     # Check if any fields are missing
-    missing_fields = set(search_order) - found_fields
+    missing_fields = TURBOMOLE_SEARCH_ORDER[found_count:]
     if missing_fields:
         warnings.warn(f"⚠️ Missing data in {filename}: {', '.join(missing_fields)}", UserWarning)
-    if not any(field in missing_fields for field in ['DX', 'DY', 'DZ']):
+    # The fields are found in order, so a group of fields is complete once its last field is found
+    if found_count > TURBOMOLE_SEARCH_ORDER.index('DZ'):
         data['D2'] = data['DX']**2 + data['DY']**2 + data['DZ']**2
         #data['dipole_strength_length'] = data['D2'] * au_to_cgs_charge_length**2
-    if not any(field in missing_fields for field in ['PX', 'PY', 'PZ']):
+    if found_count > TURBOMOLE_SEARCH_ORDER.index('PZ'):
         data['P2'] = data['PX']**2 + data['PY']**2 + data['PZ']**2
         #data['dipole_strength_velocity'] = data['P2'] * au_to_cgs_charge_length**2
-    if not any(field in missing_fields for field in ['MX', 'MY', 'MZ']):
+    if found_count > TURBOMOLE_SEARCH_ORDER.index('MZ'):
         data['M2'] = data['MX']**2 + data['MY']**2 + data['MZ']**2
-    if not any(field in missing_fields for field in ['oscillator_strength_length', 'oscillator_strength_velocity']):
+    if found_count > TURBOMOLE_SEARCH_ORDER.index('oscillator_strength_velocity'):
         data['dipole_strength_length'] = 3 * h_cgs**2 * elementary_charge_cgs**2 / (8 * pi**2 * m_e_cgs * eV_to_cgs * data['energy']) * data['oscillator_strength_length'] * 1e40
         data['dipole_strength_velocity'] = (3 * h_cgs**2 * elementary_charge_cgs**2) / (8 * pi**2 * m_e_cgs * eV_to_cgs * data['energy']) * data['oscillator_strength_velocity'] * 1e40
     return data
 
+def _read_turbomole_fields(content, data: dict, filename: str, solvant_correction: float=0) -> int:
+    """
+    Fill data with the TURBOMOLE_SEARCH_ORDER fields found in content (bytes or mmap).
+
+    Returns the number of fields found; the fields are found in order, so the found
+    ones are the first of TURBOMOLE_SEARCH_ORDER.
+    """
+    found_count = 0
+    position = 0
+    # Process each field in the expected order; then one if found move to the next and search in the next line
+    for field in TURBOMOLE_SEARCH_ORDER:
+        pattern = TURBOMOLE_PATTERNS[field]
+        literal = TURBOMOLE_LITERALS[field]
+        field_found = False
+        while position < len(content) and not field_found:
+            # Jump directly to the next line containing the literal of the field
+            literal_idx = content.find(literal, position)
+            if literal_idx == -1:
+                position = len(content)
+                break
+            line_start = content.rfind(b'\n', 0, literal_idx) + 1
+            line_end = content.find(b'\n', literal_idx)
+            if line_end == -1:
+                line_end = len(content)
+            line = content[line_start:line_end]
+            position = line_end + 1
+            match = pattern.search(line)
+            if match:
+                try:
+                    if field == 'energy':
+                        data[field] = float(match.group(1)) + solvant_correction
+                        data['wavelength'] = nm_to_eV / data['energy']
+                        energy_au = data['energy'] / eV_to_au
+                    elif field == 'PX' or field == 'PY' or field == 'PZ':
+                        data[field] = - float(match.group(1)) / energy_au # type: ignore # Velocity gauge convert to length value
+                    else:
+                        data[field] = float(match.group(1))                        
+                    found_count += 1
+                    field_found = True
+                    
+                except (ValueError, IndexError) as e:
+                    warnings.warn(f"⚠️ Error parsing {field} in {filename}: {str(e)}", UserWarning)
+        if not field_found:
+            break # The end of the file is reached, the next fields cannot be found either
+    return found_count
+
 def get_solvatation_correction(molecule: str, method_optimization: str, method_luminescence: str, warnings_list: list, working_dir=None) -> float:
     """
     Calculate solvation energy correction from the difference between solvated and non-solvated calculations.
@@ -310,30 +375,31 @@ def generate_CD(data: dict):
     The data are stored in the data dictionary.
     """
     
-    # Calculate dissymmetry factor
-    if data.get('oscillator_strength_length') and data.get('oscillator_strength_length', 0) != 0:
-        data['dissymmetry_factor_strength_length'] = 4 * data.get('rotational_strength_length', 0) / data.get('dipole_strength_length')  * 1e4
-           
-    if data.get('oscillator_strength_velocity') and data.get('oscillator_strength_velocity', 0) != 0:
-        data['dissymmetry_factor_strength_velocity'] = 4 * data.get('rotational_strength_velocity', 0) / data.get('dipole_strength_velocity')  * 1e4
-    
+    gauges = ['length', 'velocity']
+
+    # Calculate dissymmetry factor, a missing or zero oscillator strength leaves it unset
+    for gauge in gauges:
+        if data.get(f'oscillator_strength_{gauge}'):
+            data[f'dissymmetry_factor_strength_{gauge}'] = 4 * data.get(f'rotational_strength_{gauge}', 0) / data.get(f'dipole_strength_{gauge}')  * 1e4
+
     # Calculate angles (in degrees) between magnetic and electric dipole moments
-    for gauge, e_prefix, in [('length', 'D'), ('velocity', 'P')]:
+    # Scalar math: a single transition only has 2 gauges x 3 components, too few for NumPy arrays to pay off
+    m_coordinates = ['MX', 'MY', 'MZ']
+    for gauge, e_prefix in [('length', 'D'), ('velocity', 'P')]:
         e_coordinates = [f'{e_prefix}X', f'{e_prefix}Y', f'{e_prefix}Z']
-        m_coordinates = ['MX', 'MY', 'MZ']
         required_keys = m_coordinates + e_coordinates + ['M2', f'{e_prefix}2']
 
         # Check if all necessary components and norms are available and are valid numbers
-        if all(not np.isnan(data.get(key, float('nan'))) for key in required_keys):
+        if not any(isnan(data.get(key, float('nan'))) for key in required_keys):
             m2_val = data['M2']
             e2_val = data[f'{e_prefix}2']
 
             # Ensure norms are positive to avoid issues with sqrt and division by zero
             if m2_val > 1e-9 and e2_val > 1e-9:
                 dot_product = sum(data[m] * data[e] for m, e in zip(m_coordinates, e_coordinates))
-                cos_angle = np.clip(dot_product / sqrt(m2_val * e2_val), -1.0, 1.0) # Clip for numerical stability
+                cos_angle = min(max(dot_product / sqrt(m2_val * e2_val), -1.0), 1.0) # Clip for numerical stability
 
-                data[f'angle_{gauge}'] = np.degrees(np.arccos(cos_angle))
+                data[f'angle_{gauge}'] = degrees(acos(cos_angle))
                 # Dissymmetry factor calculation based on vector components
                 data[f'dissymmetry_factor_vector_{gauge}'] = 4 * sqrt(m2_val) * cos_angle / sqrt(e2_val) * 1e4 * (-fine_structure_constant) # Miss a /2 and I don't know why there is a minus sign
     return
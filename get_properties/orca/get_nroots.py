@@ -4,10 +4,11 @@ def get_nroots(file_path):
     try:
         with open(file_path, 'r') as f:
             for line in f:
-                if 'nroots' in line.lower():
-                    parts = line.strip().split()
+                lower_line = line.lower()
+                if 'nroots' in lower_line:
+                    parts = lower_line.split()
                     try:
-                        idx = [part.lower() for part in parts].index('nroots')
+                        idx = parts.index('nroots')
                         return int(parts[idx + 1])
                     except (ValueError, IndexError):
                         pass
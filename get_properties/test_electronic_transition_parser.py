@@ -0,0 +1,79 @@
+"""
+Regression tests for the ORCA parser of electronic_transition_parser.py.
+
+Run from the repository root with the repository and python_utility in PYTHONPATH:
+    PYTHONPATH=.:python_utility python -m pytest get_properties
+"""
+import math
+import pytest
+from constants import eV_to_au
+from get_properties.electronic_transition_parser import parse_orca_format
+
+SEPARATOR = '-' * 80 + '\n'
+COLUMNS = '   Transition      Energy     Energy  Wavelength fosc(D2)      D2        DX        DY        DZ\n'
+
+def orca_spectra(energy, strength):
+    """Returns the four ORCA spectra of a single TDDFT calculation."""
+    def block(title, line):
+        return SEPARATOR + title + '\n' + SEPARATOR + COLUMNS + line + '\n'
+    return (
+        block('ABSORPTION SPECTRUM VIA TRANSITION ELECTRIC DIPOLE MOMENTS',
+              f'  0-1A  ->  1-1A    {energy:.6f}   24971.6   400.5   {strength:.9f}   6.63697   2.57619  -0.02117  -0.03007\n')
+        + block('ABSORPTION SPECTRUM VIA TRANSITION VELOCITY DIPOLE MOMENTS',
+                f'  0-1A  ->  1-1A    {energy:.6f}   24971.6   400.5   0.483432143   0.08697   0.29619  -0.00217  -0.00307\n')
+        + block('CD SPECTRUM VIA TRANSITION ELECTRIC DIPOLE MOMENTS',
+                f'  0-1A  ->  1-1A    {energy:.6f}   24971.6   400.5   -12.34567   0.12345  -0.23456   0.34567\n')
+        + block('CD SPECTRUM VIA TRANSITION VELOCITY DIPOLE MOMENTS',
+                f'  0-1A  ->  1-1A    {energy:.6f}   24971.6   400.5   -11.34567   0.12345  -0.23456   0.34567\n')
+    )
+
+def filler(n_bytes):
+    """Returns about n_bytes of output lines without any transition."""
+    line = '  SCF iteration    1.234567    -0.000123 -> converged\n'
+    return line * (n_bytes // len(line) + 1)
+
+def test_multiple_tddft_blocks_first_one_is_parsed(tmp_path):
+    # e.g. an excited state optimisation printing the spectra at every cycle
+    output = tmp_path / 'multi.out'
+    output.write_text(filler(1000) + orca_spectra(3.0, 0.5) + filler(100 * 1024) + orca_spectra(2.5, 0.1) + filler(1000))
+
+    data = parse_orca_format(str(output))
+
+    assert data['energy'] == 3.0
+    assert data['oscillator_strength_length'] == 0.5
+    assert data['DZ'] == -0.03007
+    assert data['rotational_strength_length'] == -12.34567
+    assert data['rotational_strength_velocity'] == -11.34567
+
+@pytest.mark.parametrize('cut', ['ABSORPTION SPECTRUM VIA TRANSITION ELECTRIC', 'VELOCITY DIPOLE', 'CD SPECTRUM VIA TRANSITION VELOCITY'])
+def test_first_block_across_64kib_from_the_end(tmp_path, cut):
+    # Previous versions parsed the last 64 KiB first, here they start inside the first block
+    reference_file = tmp_path / 'reference.out'
+    reference_file.write_text(orca_spectra(3.0, 0.5))
+    reference = parse_orca_format(str(reference_file))
+
+    first, second = orca_spectra(3.0, 0.5), orca_spectra(2.5, 0.1)
+    after_cut = len(first) - first.index(cut) - 5
+    output = tmp_path / 'split.out'
+    output.write_text(filler(200 * 1024) + first + filler(64 * 1024 - after_cut - len(second))[:64 * 1024 - after_cut - len(second)] + second)
+
+    data = parse_orca_format(str(output))
+
+    assert data['energy'] == 3.0
+    assert data['PZ'] == pytest.approx(0.00307 / (3.0 / eV_to_au))
+    assert data == pytest.approx(reference, nan_ok=True)
+
+def test_missing_dipole_column_is_reported(tmp_path):
+    # A 7 columns line where the 8 columns electric dipole line is expected
+    output = tmp_path / 'short.out'
+    spectra = orca_spectra(3.0, 0.5).split(SEPARATOR, 3)[-1] # From the velocity spectrum onward
+    output.write_text(SEPARATOR + 'ABSORPTION SPECTRUM VIA TRANSITION ELECTRIC DIPOLE MOMENTS\n' + SEPARATOR + COLUMNS
+                      + '  0-1A  ->  1-1A    3.000000   24971.6   400.5   0.5   6.63697   2.57619  -0.02117\n\n' + spectra)
+
+    with pytest.warns(UserWarning, match='Parsing error'):
+        data = parse_orca_format(str(output))
+
+    # The values read before the error are not kept, the whole record is missing
+    for field in ['energy', 'D2', 'DX', 'DY', 'rotational_strength_length', 'rotational_strength_velocity']:
+        assert math.isnan(data[field]), field
+    assert all(math.isnan(value) for value in data.values())
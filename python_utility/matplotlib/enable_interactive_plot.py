@@ -1,3 +1,26 @@
+def make_redraw_scheduler(figure, interval=16):
+    """
+    Returns a function requesting a redraw of the figure, at most once per interval (ms).
+    Bursts of zoom/pan events are coalesced into a single draw_idle by a one-shot timer.
+    """
+    timer = figure.canvas.new_timer(interval=interval)
+    timer.single_shot = True
+    pending = False
+
+    def redraw():
+        nonlocal pending
+        pending = False
+        figure.canvas.draw_idle()
+
+    def schedule_redraw():
+        nonlocal pending
+        if not pending:
+            pending = True
+            timer.start()
+
+    timer.add_callback(redraw)
+    return schedule_redraw
+
 def enable_scroll_zoom(figure):
     """
     Adds advanced scroll-to-zoom functionality to a matplotlib figure.
@@ -5,6 +28,8 @@ def enable_scroll_zoom(figure):
     - Ctrl + Scroll: Zoom X-axis only
     - Alt + Scroll: Zoom Y-axis only
     """
+    schedule_redraw = make_redraw_scheduler(figure)
+
     def zoom_fun(event):
         base_scale = 1.2  # Strength of the zoom
         
@@ -43,21 +68,25 @@ def enable_scroll_zoom(figure):
         # 4. Apply Zoom to X-Axis
         if zoom_x:
             cur_xlim = ax.get_xlim()
-            new_width = (cur_xlim[1] - cur_xlim[0]) * scale_factor
-            # Calculate relative position of mouse within the axis
-            relx = (cur_xlim[1] - xdata) / (cur_xlim[1] - cur_xlim[0])
-            # Update limits keeping mouse position fixed
-            ax.set_xlim([xdata - new_width * (1 - relx), xdata + new_width * relx])
+            width = cur_xlim[1] - cur_xlim[0]
+            if width != 0:
+                new_width = width * scale_factor
+                # Calculate relative position of mouse within the axis
+                relx = (cur_xlim[1] - xdata) / width
+                # Update limits keeping mouse position fixed
+                ax.set_xlim([xdata - new_width * (1 - relx), xdata + new_width * relx])
 
         # 5. Apply Zoom to Y-Axis
         if zoom_y:
             cur_ylim = ax.get_ylim()
-            new_height = (cur_ylim[1] - cur_ylim[0]) * scale_factor
-            rely = (cur_ylim[1] - ydata) / (cur_ylim[1] - cur_ylim[0])
-            ax.set_ylim([ydata - new_height * (1 - rely), ydata + new_height * rely])
+            height = cur_ylim[1] - cur_ylim[0]
+            if height != 0:
+                new_height = height * scale_factor
+                rely = (cur_ylim[1] - ydata) / height
+                ax.set_ylim([ydata - new_height * (1 - rely), ydata + new_height * rely])
 
-        # 6. Redraw
-        ax.figure.canvas.draw()
+        # 6. Redraw, rapid scroll events are merged into a single draw
+        schedule_redraw()
 
     # Connect the function
     figure.canvas.mpl_connect('scroll_event', zoom_fun)
@@ -67,6 +96,8 @@ def enable_keyboard_pan(figure):
     Adds keyboard panning functionality to a matplotlib figure.
     - Arrow Keys
     """
+    schedule_redraw = make_redraw_scheduler(figure)
+
     def on_key(event):
         # 1. Check if the mouse is over a plot
         ax = event.inaxes
@@ -107,8 +138,12 @@ def enable_keyboard_pan(figure):
             # Move window down (subtract from limits)
             ax.set_ylim(ylim[0] - step_y, ylim[1] - step_y)
 
-        # 4. Redraw
-        ax.figure.canvas.draw()
+        # Other keys leave the view unchanged, nothing to redraw
+        else:
+            return
+
+        # 4. Redraw, held keys are merged into a single draw
+        schedule_redraw()
 
     # Connect the function
     figure.canvas.mpl_connect('key_press_event', on_key)
\ No newline at end of file
@@ -1,44 +1,61 @@
+from functools import lru_cache
+import numpy as np
 import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
+
+# Standard Grace Colors (RGB), the row index is the Grace color index
+GRACE_PALETTE = np.array([
+    (255, 255, 255), (0, 0, 0), (255, 0, 0),
+    (0, 255, 0), (0, 0, 255), (255, 255, 0),
+    (165, 42, 42), (190, 190, 190), (238, 130, 238),
+    (0, 255, 255), (255, 0, 255), (255, 165, 0),
+    (75, 0, 130), (128, 0, 0), (64, 224, 208),
+    (0, 139, 0)
+], dtype=np.int32)
+
+@lru_cache(maxsize=None)
+def grace_color_index_from_hex(hex_color):
+    """
+    Returns the index of the Grace color closest to hex_color ('#rrggbb').
+    Cached, as the lines of a figure usually share a few colors.
+    """
+    # 1. Parse Input Hex
+    hc = hex_color.lstrip('#')
+    rgb = np.array([int(hc[i:i+2], 16) for i in (0, 2, 4)], dtype=np.int32)
+    
+    # 2. Find Closest, all palette distances at once (first index on ties)
+    return int(((GRACE_PALETTE - rgb)**2).sum(axis=1).argmin())
+
+@lru_cache(maxsize=128)
+def hex_from_mpl_color(mpl_color):
+    """
+    Returns the hex code ('#rrggbb') of a hashable MPL color (name or rgba tuple).
+    Cached, as colors from a color cycler repeat across lines.
+    """
+    return mcolors.to_hex(mpl_color)
+
+def to_builtin_values(values):
+    """
+    Returns float64 and integer arrays as lists of Python numbers, which format as the NumPy
+    scalars do (f'{value}') but much faster. Other data are returned unchanged.
+    """
+    if type(values) is np.ndarray and (values.dtype == np.float64 or values.dtype.kind in 'iu'):
+        return values.tolist()
+    return values
 
 def save_to_agr(ax, filename):
     """
-    Saves the current Matplotlib axes to a Grace (.agr) file.
+    Saves the given Matplotlib axes to a Grace (.agr) file.
     Handles data export, titles, labels, and approximates colors.
     """
-    ax = plt.gca() # Get current axes
-    
     # --- Helper: Color Mapping (Hex -> Grace Integer) ---
     def get_grace_color_index(mpl_color):
-        # 1. Convert MPL color (name/rgba) to Hex
-        hex_color = mcolors.to_hex(mpl_color)
-        
-        # 2. Define Standard Grace Colors (RGB)
-        grace_palette = {
-            0: (255, 255, 255), 1: (0, 0, 0), 2: (255, 0, 0),
-            3: (0, 255, 0), 4: (0, 0, 255), 5: (255, 255, 0),
-            6: (165, 42, 42), 7: (190, 190, 190), 8: (238, 130, 238),
-            9: (0, 255, 255), 10: (255, 0, 255), 11: (255, 165, 0),
-            12: (75, 0, 130), 13: (128, 0, 0), 14: (64, 224, 208),
-            15: (0, 139, 0)
-        }
-        
-        # 3. Parse Input Hex
-        hc = hex_color.lstrip('#')
-        r, g, b = tuple(int(hc[i:i+2], 16) for i in (0, 2, 4))
-        
-        # 4. Find Closest
-        best_idx = 1 # Default to black
-        min_dist = float('inf')
-        for idx, (gr, gg, gb) in grace_palette.items():
-            dist = (r - gr)**2 + (g - gg)**2 + (b - gb)**2
-            if dist < min_dist:
-                min_dist = dist
-                best_idx = idx
-        return best_idx
+        # Convert MPL color (name/rgba) to Hex, lines sharing a color reuse the cached index
+        if not isinstance(mpl_color, str):
+            mpl_color = tuple(mpl_color) # rgba arrays are not hashable
+        return grace_color_index_from_hex(hex_from_mpl_color(mpl_color))
 
     # --- Write the File ---
-    with open(filename, "w") as f:
+    with open(filename, "w", buffering=1024*1024) as f: # Large buffer, the file is flushed in a few system calls
         # 1. Write Header/Titles
         f.write('@version 50121\n')
         f.write(f'@title "{ax.get_title()}"\n')
@@ -48,34 +65,36 @@ def save_to_agr(ax, filename):
         # 2. Iterate through Matplotlib lines
         lines = ax.get_lines()
         labels_seen = set()
+        styling = [] # Commands of all the lines, written at once
         
         for i, line in enumerate(lines):
             # Extract styling
             color_idx = get_grace_color_index(line.get_color())
             label = line.get_label()
             
-            # Write Grace Styling Commands
+            # Grace Styling Commands
             # Note: We use the Integer ID for color to avoid your previous syntax error
-            f.write(f'@    s{i} line color {color_idx}\n')
-            f.write(f'@    s{i} symbol 0\n') # No symbol by default
+            styling.append(f'@    s{i} line color {color_idx}\n')
+            styling.append(f'@    s{i} symbol 0\n') # No symbol by default
             
             # Handle Legend
             if label and label not in labels_seen and not label.startswith('_'):
                 labels_seen.add(label)
-                f.write(f'@    s{i} legend "{label}"\n')
+                styling.append(f'@    s{i} legend "{label}"\n')
+        
+        f.writelines(styling)
 
         # 3. Write Data
         for i, line in enumerate(lines):
             x_data = line.get_xdata()
             y_data = line.get_ydata()
             
-            f.write(f'@target G0.S{i}\n')
-            f.write(f'@type xy\n')
-            
-            for x, y in zip(x_data, y_data):
-                f.write(f'{x} {y}\n')
-            
-            f.write('&\n') # End of dataset marker
+            # Header, all the points and the end of dataset marker are written at once
+            f.writelines((
+                f'@target G0.S{i}\n@type xy\n',
+                ''.join(f'{x} {y}\n' for x, y in zip(to_builtin_values(x_data), to_builtin_values(y_data))),
+                '&\n'
+            ))
 
         # Auto-scale (optional command for Grace)
         f.write('@autoscale\n')
\ No newline at end of file
@@ -1,19 +1,55 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
 # --- Oklab Conversion Logic (D65 whitepoint) ---
 # Oklab is used because it is perceptually uniform. 
 # Euclidean distances in this space correspond to perceptual differences.
 
+# Conversion matrices, built once as the conversions are called many times by find_max_chroma
+# Linear RGB to LMS (approximate cone responses)
+M1 = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005]
+])
+# LMS (after cube root) to Oklab
+M2 = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660]
+])
+# Oklab to LMS (before cube)
+M2_INV = np.array([
+    [1.0, 0.3963377774, 0.2158037573],
+    [1.0, -0.1055613458, -0.0638541728],
+    [1.0, -0.0894841775, -1.2914855480]
+])
+# LMS to Linear RGB
+M1_INV = np.array([
+    [4.0767416621, -3.3077115913, 0.2309699292],
+    [-1.2684380046, 2.6097574011, -0.3413193965],
+    [-0.0041960863, -0.7034186147, 1.7076147010]
+])
+
 def srgb_to_linear(rgb):
     """Converts sRGB to Linear RGB."""
-    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    rgb = np.asarray(rgb, dtype=np.float64)
+    # Each branch is only evaluated on its own values
+    linear = np.empty_like(rgb)
+    low = rgb <= 0.04045
+    linear[low] = rgb[low] / 12.92
+    linear[~low] = ((rgb[~low] + 0.055) / 1.055) ** 2.4
+    return linear
 
 def linear_to_srgb(rgb):
     """Converts Linear RGB to sRGB."""
-    rgb = np.clip(rgb, 0, 1) # Clamp to valid range
-    return np.where(rgb <= 0.0031308, 12.92 * rgb, 1.055 * (rgb ** (1 / 2.4)) - 0.055)
+    rgb = np.clip(np.asarray(rgb, dtype=np.float64), 0, 1) # Clamp to valid range
+    # Each branch is only evaluated on its own values
+    srgb = np.empty_like(rgb)
+    low = rgb <= 0.0031308
+    srgb[low] = 12.92 * rgb[low]
+    srgb[~low] = 1.055 * (rgb[~low] ** (1 / 2.4)) - 0.055
+    return srgb
 
 def rgb_to_oklab(rgb_srgb):
     """Converts standard sRGB (0-1) to Oklab (L, a, b)."""
@@ -21,102 +57,147 @@ def rgb_to_oklab(rgb_srgb):
     rgb_linear = srgb_to_linear(rgb_srgb)
     
     # 2. Linear RGB to LMS (approximate cone responses)
-    m1 = np.array([
-        [0.4122214708, 0.5363325363, 0.0514459929],
-        [0.2119034982, 0.6806995451, 0.1073969566],
-        [0.0883024619, 0.2817188376, 0.6299787005]
-    ])
-    lms = np.dot(rgb_linear, m1.T)
+    lms = np.dot(rgb_linear, M1.T)
     
     # 3. Non-linear transform (cube root)
     lms_prime = np.cbrt(lms)
     
     # 4. LMS to Oklab
-    m2 = np.array([
-        [0.2104542553, 0.7936177850, -0.0040720468],
-        [1.9779984951, -2.4285922050, 0.4505937099],
-        [0.0259040371, 0.7827717662, -0.8086757660]
-    ])
-    return np.dot(lms_prime, m2.T)
+    return np.dot(lms_prime, M2.T)
 
-def oklab_to_rgb(oklab):
-    """Converts Oklab (L, a, b) to standard sRGB (0-1)."""
+def oklab_to_linear_rgb(oklab):
+    """Converts Oklab (L, a, b) to Linear RGB, without clamping."""
     # 1. Oklab to LMS
-    m2_inv = np.array([
-        [1.0, 0.3963377774, 0.2158037573],
-        [1.0, -0.1055613458, -0.0638541728],
-        [1.0, -0.0894841775, -1.2914855480]
-    ])
-    lms_prime = np.dot(oklab, m2_inv.T)
+    lms_prime = np.dot(oklab, M2_INV.T)
     
     # 2. Cube
     lms = lms_prime ** 3
     
     # 3. LMS to Linear RGB
-    m1_inv = np.array([
-        [4.0767416621, -3.3077115913, 0.2309699292],
-        [-1.2684380046, 2.6097574011, -0.3413193965],
-        [-0.0041960863, -0.7034186147, 1.7076147010]
-    ])
-    rgb_linear = np.dot(lms, m1_inv.T)
-    
-    # 4. Linear RGB to sRGB
-    return linear_to_srgb(rgb_linear)
+    return np.dot(lms, M1_INV.T)
+
+def oklab_to_rgb(oklab):
+    """Converts Oklab (L, a, b) to standard sRGB (0-1)."""
+    # Linear RGB to sRGB
+    return linear_to_srgb(oklab_to_linear_rgb(oklab))
 
 def hex_to_rgb(hex_code):
     hex_code = hex_code.lstrip('#')
     return np.array([int(hex_code[i:i+2], 16) for i in (0, 2, 4)]) / 255.0
 
 def rgb_to_hex(rgb):
-    rgb = (np.clip(rgb, 0, 1) * 255).astype(int)
-    return '#{:02x}{:02x}{:02x}'.format(*rgb)
+    # Plain Python clamp, NumPy calls cost more than the arithmetic on 3 values
+    r, g, b = (int(max(0.0, min(1.0, v)) * 255) for v in rgb)
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+def hex_to_rgb_batch(hex_codes):
+    """Converts a list of hex codes to an (n, 3) array of sRGB (0-1), decoded in one pass."""
+    hex_string = ''.join(hex_code.lstrip('#') for hex_code in hex_codes)
+    return np.frombuffer(bytes.fromhex(hex_string), dtype=np.uint8).reshape(-1, 3) / 255.0
+
+def rgb_to_hex_batch(rgb):
+    """Converts an (n, 3) array of sRGB (0-1) to a list of hex codes, encoded in one pass."""
+    hex_string = (np.clip(rgb, 0, 1) * 255).astype(np.uint8).tobytes().hex()
+    return ['#' + hex_string[i:i+6] for i in range(0, len(hex_string), 6)]
+
+# --- Gamut Boundary ---
+# Closed-form sRGB gamut intersection, ported from Bjorn Ottosson's reference code
+# (https://bottosson.github.io/posts/gamutclipping/). Works on a normalized hue (a, b).
+
+def compute_max_saturation(a, b):
+    """
+    Finds the maximum saturation S = C/L possible for a given normalized hue (a, b),
+    i.e. the point where one of the r, g or b components reaches zero.
+    """
+    # Select the component that clips first and its polynomial fit
+    if -1.88170328 * a - 0.80936493 * b > 1:
+        # Red component
+        k0, k1, k2, k3, k4 = 1.19086277, 1.76576728, 0.59662641, 0.75515197, 0.56771245
+        weights = M1_INV[0]
+    elif 1.81444104 * a - 1.19445276 * b > 1:
+        # Green component
+        k0, k1, k2, k3, k4 = 0.73956515, -0.45954404, 0.08285427, 0.12541070, 0.14503204
+        weights = M1_INV[1]
+    else:
+        # Blue component
+        k0, k1, k2, k3, k4 = 1.35733652, -0.00915799, -1.15130210, -0.50559606, 0.00692167
+        weights = M1_INV[2]
+    
+    # Approximate max saturation using a polynomial
+    S = k0 + k1 * a + k2 * b + k3 * a * a + k4 * a * b
+    
+    # Do one step of Halley's method to get closer
+    k_lms = M2_INV[:, 1] * a + M2_INV[:, 2] * b
+    lms_ = 1 + S * k_lms
+    f = np.dot(weights, lms_ ** 3)
+    f1 = np.dot(weights, 3 * k_lms * lms_ ** 2)
+    f2 = np.dot(weights, 6 * k_lms ** 2 * lms_)
+    return S - f * f1 / (f1 * f1 - 0.5 * f * f2)
+
+def find_cusp(a, b):
+    """Finds the lightness and chroma (L_cusp, C_cusp) of the most saturated color of a hue."""
+    S_cusp = compute_max_saturation(a, b)
+    # Scale the lightness so that the brightest component is exactly 1
+    rgb_at_max = oklab_to_linear_rgb(np.array([1, S_cusp * a, S_cusp * b]))
+    L_cusp = np.cbrt(1 / rgb_at_max.max())
+    return L_cusp, L_cusp * S_cusp
+
+def find_gamut_intersection(a, b, L1, C1, L0):
+    """
+    Finds intersection t of the line L = L0 * (1 - t) + t * L1, C = t * C1 with the
+    sRGB gamut boundary, for a normalized hue (a, b). L1, C1 and L0 may be arrays.
+    """
+    L1, C1, L0 = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (L1, C1, L0)))
+    L_cusp, C_cusp = find_cusp(a, b)
+    
+    t = np.empty(L1.shape)
+    lower = (L1 - L0) * C_cusp - (L_cusp - L0) * C1 <= 0
+    
+    # Lower half: the boundary is the straight line from black to the cusp
+    t[lower] = C_cusp * L0[lower] / (C1[lower] * L_cusp + C_cusp * (L0[lower] - L1[lower]))
+    
+    # Upper half: first intersect with the straight line from the cusp to white
+    upper = ~lower
+    L1, C1, L0 = L1[upper], C1[upper], L0[upper]
+    t_upper = C_cusp * (L0 - 1) / (C1 * (L_cusp - 1) + C_cusp * (L0 - L1))
+    
+    # Then one step of Halley's method on each of r, g and b
+    k_lms = M2_INV[:, 1] * a + M2_INV[:, 2] * b
+    lms_dt = (L1 - L0)[:, None] + C1[:, None] * k_lms
+    lms_ = (L0 * (1 - t_upper) + t_upper * L1)[:, None] + (t_upper * C1)[:, None] * k_lms
+    
+    rgb = np.dot(lms_ ** 3, M1_INV.T) - 1
+    rgb_dt = np.dot(3 * lms_dt * lms_ ** 2, M1_INV.T)
+    rgb_dt2 = np.dot(6 * lms_dt ** 2 * lms_, M1_INV.T)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = rgb_dt / (rgb_dt * rgb_dt - 0.5 * rgb * rgb_dt2)
+    # Only steps towards a component reaching 1 are valid
+    t_rgb = np.where(u >= 0, -rgb * u, np.inf)
+    t[upper] = t_upper + t_rgb.min(axis=-1)
+    return t
 
 # --- Generation Logic ---
 
-def find_max_chroma(L, h, tolerance=0.001, max_iterations=50):
+# Chroma below which a color is a gray, 8-bit grays only have rounding noise (~1e-8)
+ACHROMATIC_CHROMA = 1e-6
+
+def find_max_chroma(L, h):
     """
     Find maximum chroma for given lightness L and hue h that stays within sRGB gamut.
-    Uses binary search.
+    Uses the closed-form gamut intersection, at once for all the lightness values.
     
     Args:
-        L: Lightness in Oklab (0-1)
+        L: Lightness in Oklab (0-1), a float or an array of lightness values
         h: Hue angle in radians
-        tolerance: Convergence tolerance for binary search
-        max_iterations: Maximum search iterations
     
     Returns:
-        float: Maximum chroma value
+        float or np.ndarray: Maximum chroma value(s), with the shape of L
     """
-    c_min = 0.0
-    c_max = 0.5  # Start with reasonable upper bound
-    
-    # First, find an upper bound that's definitely outside gamut
-    while c_max < 2.0:  # Safety limit
-        a = c_max * np.cos(h)
-        b = c_max * np.sin(h)
-        rgb = oklab_to_rgb(np.array([L, a, b]))
-        if np.any(rgb < 0) or np.any(rgb > 1):
-            break
-        c_max *= 2
-    
-    # Binary search for maximum in-gamut chroma
-    for _ in range(max_iterations):
-        c_mid = (c_min + c_max) / 2
-        a = c_mid * np.cos(h)
-        b = c_mid * np.sin(h)
-        rgb = oklab_to_rgb(np.array([L, a, b]))
-        
-        if np.all(rgb >= 0) and np.all(rgb <= 1):
-            # In gamut, try higher chroma
-            c_min = c_mid
-        else:
-            # Out of gamut, try lower chroma
-            c_max = c_mid
-        
-        if c_max - c_min < tolerance:
-            break
-    
-    return c_min
+    L_values = np.atleast_1d(np.asarray(L, dtype=np.float64))
+    # Move along constant lightness, so t is directly the chroma at the boundary
+    max_C = find_gamut_intersection(np.cos(h), np.sin(h), L_values, 1.0, L_values)
+    return float(max_C[0]) if np.ndim(L) == 0 else max_C
 
 def generate_variants(initial_hex_colors, n_variants_per_color, spread=0.2, luminescence_min=0.2, luminescence_max=0.95):
     """
@@ -144,21 +225,23 @@ def generate_variants(initial_hex_colors, n_variants_per_color, spread=0.2, lumi
     
     results = {}
     
-    for hex_code, n_variants in zip(initial_hex_colors, n_variants_list):
+    # 1. Convert all the Bases to Oklab at once, as an (n, 3) matrix product
+    base_oklabs = rgb_to_oklab(hex_to_rgb_batch(initial_hex_colors))
+    
+    for hex_code, n_variants, base_oklab in zip(initial_hex_colors, n_variants_list, base_oklabs):
         if n_variants == 1:
             results[hex_code] = [hex_code]
             continue
         
-        # 1. Convert Base to Oklab
-        base_rgb = hex_to_rgb(hex_code)
-        base_oklab = rgb_to_oklab(base_rgb)
         L, a, b = base_oklab
         
         # 2. Calculate Polar Coordinates (Chroma and Hue)
         C = np.sqrt(a**2 + b**2)
         h = np.arctan2(b, a)
+        cos_h, sin_h = np.cos(h), np.sin(h)
         
-        generated_group = []
+        # Maximum chroma of the base color, shared by all its variants
+        base_max_C = find_max_chroma(L, h)
         
         # 3. Define lightness range
         global_spread = spread * (n_variants - 1)
@@ -176,25 +259,22 @@ def generate_variants(initial_hex_colors, n_variants_per_color, spread=0.2, lumi
 
         l_levels = np.linspace(l_min, l_max, n_variants)
         
-        for new_L in l_levels:
-            # Find maximum chroma at this lightness and hue
-            max_C = find_max_chroma(new_L, h)
-            
-            # Scale the original chroma proportionally, but cap at max_C
-            # Preserve chroma ratio relative to the base color's maximum chroma
-            base_max_C = find_max_chroma(L, h)
-            if base_max_C > 0:
-                chroma_ratio = C / base_max_C
-                new_C = min(chroma_ratio * max_C, max_C * 0.95)  # Use 95% of max for safety
-            else:
-                new_C = 0
-            
-            # Convert back to Cartesian Oklab
-            new_a = new_C * np.cos(h)
-            new_b = new_C * np.sin(h)
-            
-            new_rgb = oklab_to_rgb(np.array([new_L, new_a, new_b]))
-            generated_group.append(rgb_to_hex(new_rgb))
+        # Find maximum chroma at every lightness level and hue at once
+        max_C = find_max_chroma(l_levels, h)
+        
+        # Scale the original chroma proportionally, but cap at max_C
+        # Preserve chroma ratio relative to the base color's maximum chroma
+        if C > ACHROMATIC_CHROMA and base_max_C > 0:
+            # At most 1, the base color may lie slightly outside the approximated boundary
+            chroma_ratio = min(C / base_max_C, 1.0)
+            new_C = np.minimum(chroma_ratio * max_C, max_C * 0.95)  # Use 95% of max for safety
+        else:
+            new_C = np.zeros_like(l_levels)
+        
+        # Convert back to Cartesian Oklab, one row per variant
+        oklab_batch = np.stack([l_levels, new_C * cos_h, new_C * sin_h], axis=1)
+        new_rgb = oklab_to_rgb(oklab_batch)
+        generated_group = rgb_to_hex_batch(new_rgb)
             
         results[hex_code] = generated_group
         
@@ -208,27 +288,32 @@ def visualize_palette(palette_dict):
     fig, ax = plt.subplots(figsize=(max_variants, n_groups))
     ax.set_axis_off()
     
+    # One RGBA cell per variant, rows shorter than max_variants stay transparent
+    img = np.zeros((n_groups, max_variants, 4))
+    
     for row_idx, (seed, variants) in enumerate(palette_dict.items()):
+        variants_rgb = hex_to_rgb_batch(variants)
+        img[row_idx, :len(variants), :3] = variants_rgb
+        img[row_idx, :len(variants), 3] = 1
+        
+        # Dark colors get a white label, based on the red channel
+        dark_variants = variants_rgb[:, 0] < 128 / 255.0
+        
         # Draw seed indicator (optional, though seed is usually part of the variants logic)
-        for col_idx, color in enumerate(variants):
+        for col_idx, (color, is_dark) in enumerate(zip(variants, dark_variants)):
             # Check if this variant is the seed (approx)
             is_seed = (color.lower() == seed.lower())
             
-            rect = patches.Rectangle(
-                (col_idx, n_groups - row_idx - 1), 1, 1, 
-                linewidth=0, 
-                edgecolor='none', 
-                facecolor=color
-            )
-            ax.add_patch(rect)
-            
             # Label
-            text_color = 'white' if int(color[1:3], 16) < 128 else 'black'
+            text_color = 'white' if is_dark else 'black'
             ax.text(
                 col_idx + 0.5, n_groups - row_idx - 0.5, 
                 color, 
                 ha='center', va='center', fontsize=8, color=text_color
             )
+    
+    # All the color cells are drawn as a single image, first row at the top
+    ax.imshow(img, extent=(0, max_variants, 0, n_groups), aspect='auto', interpolation='nearest')
             
     ax.set_xlim(0, max_variants)
     ax.set_ylim(0, n_groups)
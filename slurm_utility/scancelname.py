@@ -24,6 +24,8 @@ import sys
 import subprocess
 import fnmatch
 import os
+import re
+import tempfile
 import argparse
 
 def get_current_user():
@@ -35,32 +37,42 @@ def get_current_user():
         sys.exit(1)
 
 def get_jobs(user):
-    """Get list of jobs for current user using squeue"""
+    """Yield (job_id, job_name) for each job of the current user, streamed from squeue"""
     try:
-        result = subprocess.run(
+        # stderr goes to a file, a full stderr pipe would block squeue while stdout is streamed
+        with tempfile.TemporaryFile(mode='w+') as stderr_file, subprocess.Popen(
             ['squeue', '--user', user, '--format=%i %j', '--noheader'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return [line.strip().split(maxsplit=1) for line in result.stdout.splitlines()]
-    except subprocess.CalledProcessError as e:
-        print(f"Error getting jobs: {e.stderr}")
-        sys.exit(1)
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            text=True
+        ) as process:
+            for line in process.stdout:
+                yield line.strip().split(maxsplit=1)
+            process.wait()
+            if process.returncode != 0:
+                stderr_file.seek(0)
+                print(f"Error getting jobs: {stderr_file.read()}")
+                sys.exit(1)
     except Exception as e:
         print(f"Unexpected error: {e}")
         sys.exit(1)
 
 def cancel_jobs(patterns):
     """Cancel jobs matching name patterns with confirmation"""
+    # An empty alternation would match every job
+    if not patterns:
+        print("No job name pattern given, nothing to cancel.")
+        return
+
     user = get_current_user()
-    jobs = get_jobs(user)
+    
+    # Single regex matching any of the patterns (case-sensitive, like fnmatchcase)
+    regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
     
     matches = []
-    for job_id, job_name in jobs:
-        for pattern in patterns:
-            if fnmatch.fnmatchcase(job_name, pattern):
-                matches.append((job_id, job_name))
+    for job_id, job_name in get_jobs(user):
+        if regex.match(job_name):
+            matches.append((job_id, job_name))
     
     if not matches:
         print(f"No matching jobs found for {patterns}.")